@@ -253,6 +253,7 @@ class BallsDexBot(commands.AutoShardedBot):
         log.info("Cache loaded, summary displayed below:")
         console = Console()
         console.print(table)
+        self.dispatch("ballsdex_cache_reload")
 
     async def gateway_healthy(self) -> bool:
         """Check whether or not the gateway proxy is ready and healthy."""
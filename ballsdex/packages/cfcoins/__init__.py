@@ -1,10 +1,12 @@
 from typing import TYPE_CHECKING
 
-from ballsdex.packages.cfcoins.cog import CFCoins
+from ballsdex.packages.cfcoins.cog import CFCoins, CFCoinsAdmin
 
 if TYPE_CHECKING:
     from ballsdex.core.bot import BallsDexBot
 
 
 async def setup(bot: "BallsDexBot"):
-    await bot.add_cog(CFCoins(bot))
+    cog = CFCoins(bot)
+    await bot.add_cog(cog)
+    await bot.add_cog(CFCoinsAdmin(cog))
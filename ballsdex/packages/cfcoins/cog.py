@@ -5,8 +5,15 @@ from datetime import datetime, timedelta, timezone
 import random
 from discord import Embed, Color
 import asyncio
+import contextlib
+import bisect
 import logging
-from collections import defaultdict
+import time
+from array import array
+from collections import Counter, OrderedDict, deque
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Callable, Literal
 
 logger = logging.getLogger(__name__)
 
@@ -14,6 +21,7 @@ from ballsdex.core.models import (
     Ball,
     BallInstance,
     Player,
+    balls,
 )
 from ballsdex.core.bot import BallsDexBot
 from ballsdex.core.utils.transformers import (
@@ -21,60 +29,283 @@ from ballsdex.core.utils.transformers import (
     SpecialEnabledTransform,
 )
 
+# bind the hot random functions once instead of resolving them on each call
+_randint = random.randint
+_randrange = random.randrange
+_random = random.random
+
+# colors are reused as is rather than building a new Color on every command
+COLOR_BLUE = Color.blue()
+COLOR_BRIGHT_GOLD = Color.from_rgb(255, 215, 0)
+COLOR_DARK_GRAY = Color.dark_gray()
+COLOR_GOLD = Color.gold()
+COLOR_GREEN = Color.green()
+COLOR_ORANGE = Color.orange()
+COLOR_PURPLE = Color.purple()
+COLOR_RED = Color.red()
+
 LOG_CHANNEL_ID = 1375845805793218591
-ADMIN_IDS = {1327148447673094255, 730411104450248766}
+ADMIN_IDS = frozenset({1327148447673094255, 730411104450248766})
+
+# audit logs are grouped in messages of up to LOG_BATCH_SIZE embeds (Discord's maximum),
+# waiting at most LOG_BATCH_DELAY seconds for a batch to fill
+LOG_BATCH_SIZE = 10
+LOG_BATCH_DELAY = 0.75
+LOG_QUEUE_SIZE = 1000
+# Discord limits the total characters of all the embeds in a message
+LOG_BATCH_MAX_CHARS = 6000
+
+# (name, value format) of the inline audit log fields of the admin and gift commands,
+# see `inline_fields`
+ADMIN_COINS_ADDED_LOG_FIELDS = (
+    ("Admin", "{admin_name} ({admin_id})"),
+    ("Target User", "{user_name} ({user_id})"),
+    ("Amount Added", "{amount} CF coins"),
+    ("Old Balance", "{old} CF coins"),
+    ("New Balance", "{new} CF coins"),
+)
+ADMIN_COINS_REMOVED_LOG_FIELDS = (
+    ("Admin", "{admin_name} ({admin_id})"),
+    ("Target User", "{user_name} ({user_id})"),
+    ("Amount Removed", "{amount} CF coins"),
+    ("Old Balance", "{old} CF coins"),
+    ("New Balance", "{new} CF coins"),
+)
+ADMIN_PACKS_ADDED_LOG_FIELDS = (
+    ("Admin", "{admin_name} ({admin_id})"),
+    ("Target User", "{user_name} ({user_id})"),
+    ("Pack Type", "{pack}"),
+    ("Amount Added", "{amount} packs"),
+    ("Old Amount", "{old} packs"),
+    ("New Amount", "{new} packs"),
+)
+ADMIN_PACKS_REMOVED_LOG_FIELDS = (
+    ("Admin", "{admin_name} ({admin_id})"),
+    ("Target User", "{user_name} ({user_id})"),
+    ("Pack Type", "{pack}"),
+    ("Amount Removed", "{amount} packs"),
+    ("Old Amount", "{old} packs"),
+    ("New Amount", "{new} packs"),
+)
+GIFT_COINS_LOG_FIELDS = (
+    ("Sender", "{sender_name} ({sender_id})"),
+    ("Receiver", "{receiver_name} ({receiver_id})"),
+    ("Amount", "{amount} CF coins"),
+    ("Sender New Balance", "{sender_balance} CF coins"),
+    ("Receiver New Balance", "{receiver_balance} CF coins"),
+)
+GIFT_PACKS_LOG_FIELDS = (
+    ("Sender", "{sender_name} ({sender_id})"),
+    ("Receiver", "{receiver_name} ({receiver_id})"),
+    ("Pack Type", "{pack}"),
+    ("Sender Remaining Packs", "{sender_count}"),
+    ("Receiver Total Packs", "{receiver_count}"),
+)
+# (verb, preposition, response color, audit log color, audit log fields) of each admin action,
+# a response color of None means the color of the pack
+ADMIN_ACTIONS = {
+    ("coins", "add"): ("Added", "to", COLOR_GREEN, COLOR_ORANGE, ADMIN_COINS_ADDED_LOG_FIELDS),
+    ("coins", "remove"): ("Removed", "from", COLOR_RED, COLOR_RED, ADMIN_COINS_REMOVED_LOG_FIELDS),
+    ("packs", "add"): ("Added", "to", None, COLOR_ORANGE, ADMIN_PACKS_ADDED_LOG_FIELDS),
+    ("packs", "remove"): ("Removed", "from", COLOR_RED, COLOR_RED, ADMIN_PACKS_REMOVED_LOG_FIELDS),
+}
+
+NO_PERMISSION_MESSAGE = "❌ You don't have permission to use this command!"
+# error templates of the validation branches, filled with str.format
+GIFT_SELF_MESSAGE = "❌ You cannot gift {} to yourself!"
+GIFT_BOT_MESSAGE = "❌ You cannot gift {} to a bot!"
+NO_PACK_MESSAGE = "❌ You don't have any {}s to {}!"
+BUY_NOT_ENOUGH_COINS_MESSAGE = (
+    "❌ You don't have enough CF coins! You need **{}** CF coins but only have **{}**."
+)
+GIFT_NOT_ENOUGH_COINS_MESSAGE = (
+    "❌ You don't have enough CF coins! You have **{}** CF coins but tried to gift **{}**."
+)
+PACK_OPEN_FAILED_MESSAGE = "❌ Something went wrong while opening your pack. You were refunded."
+# upper bound of the admin command amounts, enforced by Discord
+ADMIN_MAX_AMOUNT = 10**12
+
+ACCOUNT_MIN_AGE = timedelta(days=14)
+ACCOUNT_TOO_YOUNG_MESSAGE = "Your account must be at least 14 days old to use this command."
+
+# a ball sells for SELL_VALUES[i] where i is the number of thresholds its rarity reaches
+SELL_RARITY_THRESHOLDS = (0.01, 0.1, 0.5, 1.0, 2.0, 5.0, 10.0, 20.0)
+SELL_VALUES = (1300, 800, 450, 225, 115, 60, 30, 15, 7)
+
+# number of balls per page of the bulk sell menu, Discord allows up to 25 select options
+BULK_SELL_PAGE_SIZE = 25
+
+# maximum number of discord ID -> player primary key entries kept in memory
+PLAYER_PK_CACHE_SIZE = 10000
+
+# interval between two flushes of the modified wallets to the database
+WALLET_FLUSH_INTERVAL = 5
+# flush early when that many wallets are pending, bounding the size of a single batch
+WALLET_FLUSH_THRESHOLD = 500
+# maximum number of wallets kept in memory, the least recently used ones without pending
+# changes are evicted and reloaded from the database on their next use
+WALLET_CACHE_SIZE = 10000
+
+# seconds the "Opening..." message stays before the ball is revealed
+OPEN_WALKOUT_DELAY = 3
+
+# maximum number of pack opening cards drawn at the same time
+OPEN_RENDER_CONCURRENCY = 8
+
+# how long an alias table for a rarity range is reused before being rebuilt
+ALIAS_CACHE_TTL = 300
+
+
+@dataclass(slots=True, frozen=True)
+class PackInfo:
+    name: str
+    price: int
+    emoji: str
+    color: Color
+    min_rarity: float
+    max_rarity: float
+    # static strings displayed in the embeds, rendered once
+    display: str = field(init=False)
+    price_str: str = field(init=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "display", f"{self.emoji} {self.name}")
+        object.__setattr__(self, "price_str", f"{self.price} CF coins")
+
 
 PACK_TYPES = {
-    "normal": {
-        "name": "Normal Pack",
-        "price": 250,
-        "emoji": "<:normalpack:1441903613055340808>",
-        "color": Color.blue(),
-        "min_rarity": 15.0,
-        "max_rarity": 30.0,
-    },
-    "epic": {
-        "name": "Epic Pack",
-        "price": 500,
-        "emoji": "<:epicpack:1441903555379200223>",
-        "color": Color.purple(),
-        "min_rarity": 1.0,
-        "max_rarity": 5.0,
-    },
-    "mythic": {
-        "name": "Mythic Pack",
-        "price": 1500,
-        "emoji": "<:mythicpack:1441903998897750076>",
-        "color": Color.gold(),
-        "min_rarity": 0.1,
-        "max_rarity": 1.0,
-    },
-    "legendary": {
-        "name": "Legendary Pack",
-        "price": 5000,
-        "emoji": "<:legendarypack:1441903650086715552>",
-        "color": Color.from_rgb(255, 215, 0),
-        "min_rarity": 0.01,
-        "max_rarity": 0.1,
-    },
+    "normal": PackInfo(
+        name="Normal Pack",
+        price=250,
+        emoji="<:normalpack:1441903613055340808>",
+        color=COLOR_BLUE,
+        min_rarity=15.0,
+        max_rarity=30.0,
+    ),
+    "epic": PackInfo(
+        name="Epic Pack",
+        price=500,
+        emoji="<:epicpack:1441903555379200223>",
+        color=COLOR_PURPLE,
+        min_rarity=1.0,
+        max_rarity=5.0,
+    ),
+    "mythic": PackInfo(
+        name="Mythic Pack",
+        price=1500,
+        emoji="<:mythicpack:1441903998897750076>",
+        color=COLOR_GOLD,
+        min_rarity=0.1,
+        max_rarity=1.0,
+    ),
+    "legendary": PackInfo(
+        name="Legendary Pack",
+        price=5000,
+        emoji="<:legendarypack:1441903650086715552>",
+        color=COLOR_BRIGHT_GOLD,
+        min_rarity=0.01,
+        max_rarity=0.1,
+    ),
 }
 
 
+class PackType(IntEnum):
+    NORMAL = 0
+    EPIC = 1
+    MYTHIC = 2
+    LEGENDARY = 3
+
+
+# the packs of a user are stored as a list of counts indexed by PackType
+PACK_TYPE_INDEXES = {name: PackType(i) for i, name in enumerate(PACK_TYPES)}
+PACK_INFOS = tuple(PACK_TYPES.values())
+# static start of each line of the wallet's pack list
+WALLET_PACK_LABELS = tuple(f"{x.emoji} **{x.name}:** " for x in PACK_INFOS)
+# read-only inventory of users who never got a pack, avoids allocating a list per lookup
+NO_PACKS = (0,) * len(PackType)
+
+
+def inline_fields(template: tuple[tuple[str, str], ...], values: dict) -> list[dict]:
+    """
+    Build inline embed fields in the API format from a template of names and value formats.
+    """
+    return [
+        {"name": name, "value": fmt.format_map(values), "inline": True}
+        for name, fmt in template
+    ]
+
+
+def account_too_young(user: discord.abc.User) -> bool:
+    """
+    Whether the account is too recent to claim rewards.
+    """
+    return user.created_at > datetime.now(timezone.utc) - ACCOUNT_MIN_AGE
+
+
+def claim_cooldown(per: float):
+    """
+    Cooldown factory for the reward commands. Accounts too young to claim are rejected by the
+    command itself and do not consume their cooldown.
+    """
+
+    def factory(interaction: discord.Interaction) -> app_commands.Cooldown | None:
+        if account_too_young(interaction.user):
+            return None
+        return app_commands.Cooldown(1, per)
+
+    return factory
+
+
+def build_alias_table(weights: list[float]) -> tuple[array, array]:
+    """
+    Build Vose's alias table for the given weights, allowing O(1) weighted sampling.
+
+    Returns the ``prob`` and ``alias`` arrays: pick ``i`` uniformly, then keep ``i`` with
+    probability ``prob[i]``, else take ``alias[i]``.
+    """
+    n = len(weights)
+    total = sum(weights)
+    scaled = [w * n / total for w in weights]
+    prob = array("d", [0.0] * n)
+    alias = array("i", [0] * n)
+
+    small: deque[int] = deque()
+    large: deque[int] = deque()
+    for i, q in enumerate(scaled):
+        (small if q < 1.0 else large).append(i)
+
+    while small and large:
+        s = small.popleft()
+        l = large.popleft()  # noqa: E741
+        prob[s] = scaled[s]
+        alias[s] = l
+        scaled[l] -= 1.0 - scaled[s]
+        (small if scaled[l] < 1.0 else large).append(l)
+
+    # leftovers are only due to floating point imprecision, they are always kept
+    for i in large:
+        prob[i] = 1.0
+    for i in small:
+        prob[i] = 1.0
+    return prob, alias
+
+
 class BallSelectDropdown(discord.ui.Select):
-    def __init__(self, balls: list, page: int = 0):
-        self.balls = balls
+    def __init__(self, page_balls: list[BallInstance], page: int = 0):
+        super().__init__(min_values=0)
+        self.set_page(page_balls, page)
+
+    def set_page(self, page_balls: list[BallInstance], page: int):
+        """
+        Show another page of balls, reusing this component instead of rebuilding one.
+        """
         self.page = page
-        self.balls_per_page = 25
-        
-        start_idx = page * self.balls_per_page
-        end_idx = min(start_idx + self.balls_per_page, len(balls))
-        page_balls = balls[start_idx:end_idx]
         
         options = []
         for ball in page_balls:
             ball_id = f"#{ball.pk:0X}"
-            ball_name = ball.ball.country
-            rarity = ball.ball.rarity
+            ball_name = ball.countryball.country
+            rarity = ball.countryball.rarity
             label = f"{ball_name} {ball_id}"
             description = f"Rarity: {rarity}"
             if ball.favorite:
@@ -86,31 +317,52 @@ class BallSelectDropdown(discord.ui.Select):
                 value=str(ball.pk)
             ))
         
-        super().__init__(
-            placeholder=f"Select balls to sell (Page {page + 1})",
-            min_values=0,
-            max_values=len(options),
-            options=options
-        )
+        self.options = options
+        self.placeholder = f"Select balls to sell (Page {page + 1})"
+        self.max_values = len(options)
     
     async def callback(self, interaction: discord.Interaction):
         await interaction.response.defer()
 
 
 class BulkSellView(discord.ui.View):
-    def __init__(self, cog, user: discord.User, balls: list, user_id: str):
+    """
+    Only the current page of balls is kept in memory, the next one is fetched when needed.
+    """
+
+    def __init__(
+        self,
+        cog,
+        user: discord.User,
+        player_pk: int,
+        total_balls: int,
+        page_balls: list[BallInstance],
+        user_id: int,
+    ):
         super().__init__(timeout=300)
         self.cog = cog
         self.user = user
-        self.all_balls = [b for b in balls if not b.favorite]
+        self.player_pk = player_pk
+        self.page_balls = page_balls
         self.user_id = user_id
         self.selected_balls = []
+        self.selected_pks: set[int] = set()
         self.cached_values = {}
+        # kept up to date on selection, instead of summing over the whole selection each click
+        self.total_value = 0
         self.current_page = 0
-        self.total_pages = (len(self.all_balls) + 24) // 25
+        self.total_pages = (total_balls + BULK_SELL_PAGE_SIZE - 1) // BULK_SELL_PAGE_SIZE
         
-        self.dropdown = BallSelectDropdown(self.all_balls, self.current_page)
+        self.dropdown = BallSelectDropdown(self.page_balls, self.current_page)
         self.add_item(self.dropdown)
+
+    async def fetch_page(self, page: int) -> list[BallInstance]:
+        return await (
+            BallInstance.filter(player_id=self.player_pk, favorite=False)
+            .order_by("id")
+            .offset(page * BULK_SELL_PAGE_SIZE)
+            .limit(BULK_SELL_PAGE_SIZE)
+        )
     
     async def interaction_check(self, interaction: discord.Interaction) -> bool:
         if interaction.user.id != self.user.id:
@@ -125,21 +377,16 @@ class BulkSellView(discord.ui.View):
         selected_text = "None"
         if self.selected_balls:
             selected_text = "\n".join([
-                f"• {b.ball.country} #{b.pk:0X} (Rarity: {b.ball.rarity})"
+                f"• {b.countryball.country} #{b.pk:0X} (Rarity: {b.countryball.rarity})"
                 for b in self.selected_balls[:10]
             ])
             if len(self.selected_balls) > 10:
                 selected_text += f"\n... and {len(self.selected_balls) - 10} more"
         
-        total_value = sum(
-            self.cached_values.get(b.pk, 0)
-            for b in self.selected_balls
-        )
-        
         embed = Embed(
             title="💰 Bulk Sell",
             description="Select the balls you want to sell.",
-            color=Color.blue()
+            color=COLOR_BLUE
         )
         embed.add_field(
             name="📊 Selected", 
@@ -148,7 +395,7 @@ class BulkSellView(discord.ui.View):
         )
         embed.add_field(
             name="💰 Total Value",
-            value=f"{total_value} CF coins",
+            value=f"{self.total_value} CF coins",
             inline=True
         )
         embed.add_field(
@@ -176,78 +423,97 @@ class BulkSellView(discord.ui.View):
             return
         
         await interaction.response.defer()
+        # ignore further clicks on this menu
+        self.stop()
         
-        total_coins = 0
-        sold_balls = []
-        
-        for ball in self.selected_balls:
-            await ball.fetch_related("ball")
-            coins = self.cached_values.get(ball.pk, 0)
-            total_coins += coins
-            sold_balls.append(f"{ball.ball.country} #{ball.pk:0X}")
-            await ball.delete()
-        
-        self.cog.bot.cf_wallet[self.user_id] += total_coins
+        # the same balls may be selected in another menu of this user, only one sale may go
+        # through, and only balls still owned and not favorited are sold
+        async with self.cog._user_lock(self.user_id):
+            owned = set(
+                await BallInstance.filter(
+                    pk__in=list(self.selected_pks), player_id=self.player_pk, favorite=False
+                ).values_list("id", flat=True)
+            )
+            if not owned:
+                await interaction.edit_original_response(
+                    content="❌ None of the selected balls can be sold anymore.",
+                    embed=None,
+                    view=None,
+                )
+                return
+            await BallInstance.filter(pk__in=list(owned)).delete()
+            sold = [b for b in self.selected_balls if b.pk in owned]
+            total_coins = sum(self.cached_values[b.pk] for b in sold)
+            # the wallet may have been evicted while the menu was open
+            await self.cog._ensure_loaded(self.user_id)
+            _, balance = self.cog._adjust_coins(self.user_id, total_coins)
+        sold_balls = [f"{b.countryball.country} #{b.pk:0X}" for b in sold]
         
         embed = Embed(
             title="✅ Bulk Sell Complete!",
             description=f"You sold **{len(sold_balls)} balls** for **{total_coins} CF coins**!",
-            color=Color.green()
+            color=COLOR_GREEN
         )
         embed.add_field(
             name="💳 New Balance",
-            value=f"{self.cog.bot.cf_wallet[self.user_id]} CF coins",
+            value=f"{balance} CF coins",
             inline=False
         )
         
         await interaction.edit_original_response(embed=embed, view=None)
         
         logger.info(
-            f"[CF COINS BULK SELL] {self.user} ({self.user.id}) "
-            f"sold {len(sold_balls)} balls for {total_coins} CF coins"
+            "[CF COINS BULK SELL] %s (%s) sold %d balls for %d CF coins",
+            self.user,
+            self.user.id,
+            len(sold_balls),
+            total_coins,
         )
         
-        await self.cog.log_action(
+        self.cog._log_async(
             title="💰 Bulk Sell",
             description=f"{self.user.mention} sold multiple balls",
-            color=Color.green(),
+            color=COLOR_GREEN,
             fields=[
                 {"name": "User", "value": f"{self.user.name} ({self.user.id})", "inline": True},
                 {"name": "Balls Sold", "value": f"{len(sold_balls)}", "inline": True},
                 {"name": "Total Coins Earned", "value": f"{total_coins} CF coins", "inline": True},
-                {"name": "New Balance", "value": f"{self.cog.bot.cf_wallet[self.user_id]} CF coins", "inline": True},
+                {"name": "New Balance", "value": f"{balance} CF coins", "inline": True},
                 {"name": "Balls", "value": ", ".join(sold_balls[:10]) + (f"... and {len(sold_balls) - 10} more" if len(sold_balls) > 10 else ""), "inline": False}
             ]
         )
-        
-        self.stop()
     
     @discord.ui.button(label="Clear", style=discord.ButtonStyle.secondary, row=2)
     async def clear_button(self, interaction: discord.Interaction, button: discord.ui.Button):
         self.selected_balls = []
+        self.selected_pks.clear()
+        self.total_value = 0
         await self.update_embed(interaction)
     
     @discord.ui.button(label="Select Page", style=discord.ButtonStyle.primary, row=2)
     async def select_page_button(self, interaction: discord.Interaction, button: discord.ui.Button):
         selected_values = self.dropdown.values
+        # the next page is read from the database
+        await interaction.response.defer()
         
-        start_idx = self.current_page * 25
-        end_idx = min(start_idx + 25, len(self.all_balls))
-        page_balls = self.all_balls[start_idx:end_idx]
-        
+        page_balls = {b.pk: b for b in self.page_balls}
         for value in selected_values:
-            ball_pk = int(value)
-            ball = next((b for b in page_balls if b.pk == ball_pk), None)
-            if ball and ball not in self.selected_balls:
+            ball = page_balls.get(int(value))
+            if ball and ball.pk not in self.selected_pks:
                 self.selected_balls.append(ball)
-                if ball.pk not in self.cached_values:
-                    self.cached_values[ball.pk] = self.cog.calculate_sell_value(ball.ball.rarity)
+                self.selected_pks.add(ball.pk)
+                value = self.cached_values.get(ball.pk)
+                if value is None:
+                    value = self.cog.calculate_sell_value(ball.countryball.rarity)
+                    self.cached_values[ball.pk] = value
+                self.total_value += value
         
         if self.current_page < self.total_pages - 1:
-            self.current_page += 1
-            self.remove_item(self.dropdown)
-            self.dropdown = BallSelectDropdown(self.all_balls, self.current_page)
-            self.add_item(self.dropdown)
+            # the collection may have shrunk since the count, stay on this page if so
+            if next_balls := await self.fetch_page(self.current_page + 1):
+                self.current_page += 1
+                self.page_balls = next_balls
+                self.dropdown.set_page(self.page_balls, self.current_page)
         
         await self.update_embed(interaction)
 
@@ -259,109 +525,481 @@ class CFCoins(commands.GroupCog, name="cfcoins"):
 
     def __init__(self, bot: BallsDexBot):
         self.bot = bot
+        # reads must not insert entries for users who never owned anything, hence no defaultdict
         if not hasattr(bot, 'cf_wallet'):
-            bot.cf_wallet = defaultdict(int)
+            bot.cf_wallet = Counter()
         if not hasattr(bot, 'cf_packs'):
-            bot.cf_packs = defaultdict(lambda: {"normal": 0, "epic": 0, "mythic": 0, "legendary": 0})
+            bot.cf_packs = {}
+        self._alias_cache: dict[
+            tuple[float, float], tuple[float, tuple[Ball, ...], array, array]
+        ] = {}
+        self._log_channel: discord.abc.Messageable | None = None
+        # None is queued on unload to make the flusher send what is left and stop
+        self._log_queue: asyncio.Queue[Embed | None] = asyncio.Queue(maxsize=LOG_QUEUE_SIZE)
+        self._log_task: asyncio.Task | None = None
+        # wallets are persisted in Player.extra_data, loaded on first use and written behind
+        self._loaded: OrderedDict[int, None] = OrderedDict()
+        self._dirty: set[int] = set()
+        # users whose changes are being written by the current flush
+        self._flushing: set[int] = set()
+        self._flush_task: asyncio.Task | None = None
+        self._flush_now = asyncio.Event()
+        self._render_semaphore = asyncio.Semaphore(OPEN_RENDER_CONCURRENCY)
+        self._player_pks: OrderedDict[int, int] = OrderedDict()
+        self._player_lock = asyncio.Lock()
+        # lock and number of users of the lock, per discord ID
+        self._user_locks: dict[int, list] = {}
+        # the shop content is static, only the author is set per invocation
+        self._shop_embed = self._build_shop_embed()
         super().__init__()
 
+    @staticmethod
+    def _build_shop_embed() -> Embed:
+        embed = Embed(
+            title="🏪 CF Coins Pack Shop",
+            description="Purchase packs with your CF coins to get rare balls!",
+            color=COLOR_GOLD,
+        )
+
+        for pack_type, pack_info in PACK_TYPES.items():
+            embed.add_field(
+                name=pack_info.display,
+                value=(
+                    f"**Price:** {pack_info.price_str}\n"
+                    f"**Rarity Range:** {pack_info.min_rarity} - {pack_info.max_rarity}\n"
+                    f"Use `/cfcoins buy {pack_type}` to purchase!"
+                ),
+                inline=False,
+            )
+
+        embed.set_footer(text="Use /cfcoins buy <pack_type> to purchase a pack!")
+        return embed
+
+    async def cog_load(self):
+        self._warm_alias_tables()
+        self._flush_task = asyncio.create_task(self._flush_loop())
+        self._log_task = asyncio.create_task(self._log_flusher())
+
+    async def cog_unload(self):
+        if self._flush_task:
+            self._flush_task.cancel()
+            # a flush interrupted by the cancel puts its users back in the dirty set
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._flush_task
+        await self._flush()
+        # let the pending audit logs go through before the cog disappears
+        if self._log_task and not self._log_task.done():
+            await self._log_queue.put(None)
+            await self._log_task
+        # logs queued after the flusher stopped, still sent in batches
+        leftovers: list[Embed] = []
+        while not self._log_queue.empty():
+            if (embed := self._log_queue.get_nowait()) is not None:
+                leftovers.append(embed)
+        batch: list[Embed] = []
+        size = 0
+        for embed in leftovers:
+            if len(batch) == LOG_BATCH_SIZE or size + len(embed) > LOG_BATCH_MAX_CHARS:
+                await self._send_logs(batch)
+                batch, size = [], 0
+            batch.append(embed)
+            size += len(embed)
+        if batch:
+            await self._send_logs(batch)
+
+    async def _ensure_loaded(self, *user_ids: int):
+        """
+        Load the persisted wallet and packs of the given users if not already in memory.
+        """
+        missing = []
+        for user_id in user_ids:
+            if user_id in self._loaded:
+                self._loaded.move_to_end(user_id)
+            else:
+                missing.append(user_id)
+        if not missing:
+            return
+        rows = await Player.filter(discord_id__in=missing).values_list(
+            "discord_id", "extra_data"
+        )
+        for user_id, extra_data in rows:
+            if user_id in self._loaded:
+                continue  # loaded by a concurrent command while we were waiting
+            extra_data = extra_data or {}
+            if coins := extra_data.get("cf_coins"):
+                self.bot.cf_wallet[user_id] = coins
+            if packs := extra_data.get("cf_packs"):
+                self.bot.cf_packs[user_id] = [packs.get(name, 0) for name in PACK_TYPES]
+        self._loaded.update(dict.fromkeys(missing))
+        self._evict_wallets()
+
+    def _evict_wallets(self):
+        """
+        Drop the least recently used wallets once over WALLET_CACHE_SIZE. Wallets with changes
+        not yet written are kept.
+        """
+        excess = len(self._loaded) - WALLET_CACHE_SIZE
+        if excess <= 0:
+            return
+        evicted = []
+        for user_id in self._loaded:
+            if len(evicted) == excess:
+                break
+            if user_id not in self._dirty and user_id not in self._flushing:
+                evicted.append(user_id)
+        for user_id in evicted:
+            del self._loaded[user_id]
+            self.bot.cf_wallet.pop(user_id, None)
+            self.bot.cf_packs.pop(user_id, None)
+
+    @contextlib.asynccontextmanager
+    async def _user_lock(self, user_id: int):
+        """
+        Serialize the operations of a single user, other users are not blocked. Locks are
+        dropped once nobody holds or waits for them.
+        """
+        entry = self._user_locks.get(user_id)
+        if entry is None:
+            entry = self._user_locks[user_id] = [asyncio.Lock(), 0]
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                yield
+        finally:
+            entry[1] -= 1
+            if not entry[1]:
+                del self._user_locks[user_id]
+
+    def _mark_dirty(self, *user_ids: int):
+        self._dirty.update(user_ids)
+        if len(self._dirty) >= WALLET_FLUSH_THRESHOLD:
+            self._flush_now.set()
+
+    def _store_wallet(self, player: Player):
+        """
+        Copy the in-memory wallet and packs of the player into its ``extra_data``.
+        """
+        user_id = player.discord_id
+        player.extra_data["cf_coins"] = self.bot.cf_wallet[user_id]
+        player.extra_data["cf_packs"] = dict(zip(PACK_TYPES, self._peek_packs(user_id)))
+
+    async def _flush(self):
+        """
+        Write the modified wallets and packs to the database in a single batch.
+        """
+        if not self._dirty:
+            return
+        dirty, self._dirty = self._dirty, set()
+        self._flushing = dirty
+        try:
+            players = {
+                x.discord_id: x
+                for x in await Player.filter(discord_id__in=dirty)
+            }
+            to_create: list[Player] = []
+            for user_id in dirty:
+                player = players.get(user_id)
+                if player is None:
+                    player = Player(discord_id=user_id, extra_data={})
+                    to_create.append(player)
+                self._store_wallet(player)
+            if players:
+                await Player.bulk_update(list(players.values()), fields=["extra_data"])
+            if to_create:
+                await Player.bulk_create(to_create, ignore_conflicts=True)
+                # rows created concurrently (by get_or_create for instance) were skipped by the
+                # insert, write the wallets over them
+                created = await Player.filter(
+                    discord_id__in=[x.discord_id for x in to_create]
+                )
+                for player in created:
+                    self._store_wallet(player)
+                if created:
+                    await Player.bulk_update(created, fields=["extra_data"])
+        except Exception:
+            logger.exception("Failed to persist CF wallets, retrying on next flush")
+            self._dirty.update(dirty)
+        except BaseException:
+            # cancelled while writing, keep the changes for the next flush
+            self._dirty.update(dirty)
+            raise
+        finally:
+            self._flushing = set()
+
+    async def _flush_loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_now.wait(), timeout=WALLET_FLUSH_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_now.clear()
+            await self._flush()
+
+    async def _get_player_pk(self, discord_id: int) -> int:
+        """
+        Return the primary key of the player, creating it if needed. Results are cached, the
+        least recently used entries being evicted first.
+        """
+        if (pk := self._player_pks.get(discord_id)) is not None:
+            self._player_pks.move_to_end(discord_id)
+            return pk
+        # serialize misses so that concurrent first commands don't race to create the player
+        async with self._player_lock:
+            if (pk := self._player_pks.get(discord_id)) is not None:
+                return pk
+            player, _ = await Player.get_or_create(discord_id=discord_id)
+            if len(self._player_pks) >= PLAYER_PK_CACHE_SIZE:
+                self._player_pks.popitem(last=False)
+            self._player_pks[discord_id] = player.pk
+        return player.pk
+
+    def _adjust_coins(self, user_id: int, delta: int) -> tuple[int, int]:
+        """
+        Add ``delta`` coins to the user's wallet, clamping at 0. Returns the old and new balance.
+
+        There is no await between the read and the write, making this atomic for the event loop.
+        Call `_ensure_loaded` right before, a wallet loaded by an earlier interaction may have
+        been evicted since then.
+        """
+        old = self.bot.cf_wallet[user_id]
+        new = max(0, old + delta)
+        self.bot.cf_wallet[user_id] = new
+        self._mark_dirty(user_id)
+        return old, new
+
+    def _try_debit(self, user_id: int, amount: int) -> int | None:
+        """
+        Take ``amount`` coins from the user if they can afford it, returning the new balance, or
+        ``None`` if the balance is insufficient.
+
+        The check and the debit happen without awaiting, so two concurrent purchases can't both
+        spend the same coins. Keep it that way.
+        """
+        balance = self.bot.cf_wallet[user_id]
+        if balance < amount:
+            return None
+        balance -= amount
+        self.bot.cf_wallet[user_id] = balance
+        self._mark_dirty(user_id)
+        return balance
+
+    def _adjust_packs(self, user_id: int, pack: PackType, delta: int) -> tuple[int, int]:
+        """
+        Add ``delta`` packs of the given type to the user, clamping at 0. Returns the old and new
+        count.
+        """
+        packs = self._get_packs(user_id)
+        old = packs[pack]
+        new = max(0, old + delta)
+        packs[pack] = new
+        self._mark_dirty(user_id)
+        return old, new
+
+    def _peek_coins(self, user_id: int) -> int:
+        return self.bot.cf_wallet[user_id]
+
+    def _peek_packs(self, user_id: int) -> "list[int] | tuple[int, ...]":
+        return self.bot.cf_packs.get(user_id, NO_PACKS)
+
+    def _get_packs(self, user_id: int) -> list[int]:
+        return self.bot.cf_packs.setdefault(user_id, [0] * len(PackType))
+
     def calculate_sell_value(self, rarity: float) -> int:
-        if rarity >= 20.0:
-            return 7
-        elif rarity >= 10.0:
-            return 15
-        elif rarity >= 5.0:
-            return 30
-        elif rarity >= 2.0:
-            return 60
-        elif rarity >= 1.0:
-            return 115
-        elif rarity >= 0.5:
-            return 225
-        elif rarity >= 0.1:
-            return 450
-        elif rarity >= 0.01:
-            return 800
-        else:
-            return 1300
+        return SELL_VALUES[bisect.bisect_right(SELL_RARITY_THRESHOLDS, rarity)]
 
-    async def get_random_ball_in_range(
+    def _get_alias_table(
         self, min_rarity: float, max_rarity: float
-    ) -> Ball | None:
-        all_balls = await Ball.filter(
-            rarity__gte=min_rarity, rarity__lte=max_rarity, enabled=True
-        ).all()
+    ) -> tuple[float, tuple[Ball, ...], array, array] | None:
+        key = (min_rarity, max_rarity)
+        entry = self._alias_cache.get(key)
+        if entry and entry[0] > time.monotonic():
+            return entry
 
+        # the bot already keeps every ball in memory, no need to query the database
+        # only references to the cached balls are kept, no row or column is copied
+        all_balls = tuple(
+            x for x in balls.values() if x.enabled and min_rarity <= x.rarity <= max_rarity
+        )
         if not all_balls:
+            self._alias_cache.pop(key, None)
             return None
 
-        weighted_choices = []
-        for ball in all_balls:
-            weight = 1.0 / ball.rarity if ball.rarity > 0 else 100
-            weighted_choices.append((ball, weight))
+        weights = [1.0 / ball.rarity if ball.rarity > 0 else 100 for ball in all_balls]
+        prob, alias = build_alias_table(weights)
+        entry = (time.monotonic() + ALIAS_CACHE_TTL, all_balls, prob, alias)
+        self._alias_cache[key] = entry
+        return entry
 
-        total_weight = sum(w for _, w in weighted_choices)
-        random_value = random.uniform(0, total_weight)
+    def get_random_ball_in_range(self, min_rarity: float, max_rarity: float) -> Ball | None:
+        entry = self._get_alias_table(min_rarity, max_rarity)
+        if entry is None:
+            return None
 
-        cumulative = 0
-        for ball, weight in weighted_choices:
-            cumulative += weight
-            if random_value <= cumulative:
-                return ball
+        _, all_balls, prob, alias = entry
+        i = _randrange(len(all_balls))
+        return all_balls[i] if _random() < prob[i] else all_balls[alias[i]]
+
+    async def _open_packs(
+        self, player_pk: int, pack_info: PackInfo, count: int = 1
+    ) -> list[BallInstance]:
+        """
+        Draw and save the balls of ``count`` packs of the given type, returning the instances.
+
+        Multiple packs are inserted with a single query. A single pack is saved on its own
+        instead, its primary key is needed to display the card.
+        """
+        instances = []
+        for _ in range(count):
+            ball = self.get_random_ball_in_range(pack_info.min_rarity, pack_info.max_rarity)
+            if ball is None:
+                break
+            instances.append(
+                BallInstance(
+                    ball=ball,
+                    player_id=player_pk,
+                    attack_bonus=_randint(-20, 20),
+                    health_bonus=_randint(-20, 20),
+                )
+            )
+        if len(instances) == 1:
+            await instances[0].save()
+        elif instances:
+            await BallInstance.bulk_create(instances)
+        return instances
+
+    async def _render_card(
+        self, instance: BallInstance, interaction: discord.Interaction[BallsDexBot]
+    ) -> tuple[str, discord.File, discord.ui.View]:
+        """
+        Render the card of an opened ball, with at most OPEN_RENDER_CONCURRENCY renders at once
+        so that bursts of openings don't spawn a thread pool each.
+        """
+        async with self._render_semaphore:
+            return await instance.prepare_for_message(interaction)
+
+    def _warm_alias_tables(self):
+        """
+        Build the alias tables of every pack type ahead of time, keeping the first opening of
+        each pack off the slow path.
+        """
+        for pack_info in PACK_INFOS:
+            self._get_alias_table(pack_info.min_rarity, pack_info.max_rarity)
+
+    @commands.Cog.listener()
+    async def on_ballsdex_cache_reload(self):
+        self._alias_cache.clear()
+        self._warm_alias_tables()
+
+    def _log_async(
+        self, title: str, description: str, color: Color, fields: list | None = None
+    ):
+        """
+        Queue an audit log embed, sent in batches by `_log_flusher` so the command doesn't wait
+        on the log channel and bursts stay under the channel rate limit.
+        """
+        # fields are already given in the API format, no need to add them one by one
+        embed = Embed.from_dict(
+            {
+                "title": title,
+                "description": description,
+                "color": color.value,
+                "timestamp": discord.utils.utcnow().isoformat(),
+                "fields": fields or [],
+            }
+        )
+        try:
+            self._log_queue.put_nowait(embed)
+        except asyncio.QueueFull:
+            logger.warning("CF coins log queue is full, dropping log %r", title)
 
-        return weighted_choices[-1][0] if weighted_choices else None
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel):
+        if channel.id == LOG_CHANNEL_ID:
+            self._log_channel = None
 
-    async def log_action(self, title: str, description: str, color: Color, fields: list = None):
+    async def _send_logs(self, embeds: list[Embed]):
         try:
-            log_channel = self.bot.get_channel(LOG_CHANNEL_ID)
-            if not log_channel:
-                logger.warning(f"Log channel {LOG_CHANNEL_ID} not found")
+            log_channel = self._log_channel
+            if log_channel is None:
+                log_channel = self.bot.get_channel(LOG_CHANNEL_ID)
+                if not log_channel:
+                    logger.warning("Log channel %s not found", LOG_CHANNEL_ID)
+                    return
+                self._log_channel = log_channel
+
+            await log_channel.send(embeds=embeds)
+        except Exception:
+            logger.exception("Failed to send %d CF coins log(s)", len(embeds))
+
+    async def _log_flusher(self):
+        loop = asyncio.get_running_loop()
+        carry: Embed | None = None
+        stopping = False
+        while not stopping:
+            first = carry if carry is not None else await self._log_queue.get()
+            if first is None:
                 return
-            
-            embed = Embed(
-                title=title,
-                description=description,
-                color=color,
-                timestamp=datetime.now(timezone.utc)
-            )
-            
-            if fields:
-                for field in fields:
-                    embed.add_field(
-                        name=field.get("name", ""),
-                        value=field.get("value", ""),
-                        inline=field.get("inline", False)
-                    )
-            
-            await log_channel.send(embed=embed)
-        except Exception as e:
-            logger.error(f"Failed to log action: {e}")
-
-    @app_commands.command(name="daily", description="Claim your daily CF coins!")
-    @app_commands.checks.cooldown(1, 86400, key=lambda i: i.user.id)
-    async def daily(self, interaction: discord.Interaction[BallsDexBot]):
-        user_id = str(interaction.user.id)
+            embeds = [first]
+            carry = None
+            size = len(first)
+            # give other logs a short window to join this message
+            deadline = loop.time() + LOG_BATCH_DELAY
+            while len(embeds) < LOG_BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    embed = await asyncio.wait_for(self._log_queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if embed is None:
+                    # unloading, send this last batch and stop
+                    stopping = True
+                    break
+                if size + len(embed) > LOG_BATCH_MAX_CHARS:
+                    carry = embed  # starts the next message
+                    break
+                embeds.append(embed)
+                size += len(embed)
+            await self._send_logs(embeds)
+
+    async def _claim(
+        self,
+        interaction: discord.Interaction[BallsDexBot],
+        *,
+        period: str,
+        low: int,
+        high: int,
+        title: str,
+        color: Color,
+        footer: str,
+        log_title: str,
+    ):
+        """
+        Shared implementation of the daily and weekly rewards.
+        """
+        user_id = interaction.user.id
 
-        min_creation = datetime.now(timezone.utc) - timedelta(days=14)
-        if interaction.user.created_at > min_creation:
+        if account_too_young(interaction.user):
             await interaction.response.send_message(
-                "Your account must be at least 14 days old to use this command.",
+                ACCOUNT_TOO_YOUNG_MESSAGE,
                 ephemeral=True,
             )
             return
 
-        coins = random.randint(30, 60)
-        self.bot.cf_wallet[user_id] += coins
+        coins = _randint(low, high)
+        await self._ensure_loaded(user_id)
+        _, balance = self._adjust_coins(user_id, coins)
 
         embed = Embed(
-            title="💰 Daily CF Coins Claimed!",
+            title=title,
             description=f"You received **{coins} CF coins**!",
-            color=Color.green(),
+            color=color,
         )
         embed.add_field(
-            name="💳 Your Balance", value=f"{self.bot.cf_wallet[user_id]} CF coins", inline=False
+            name="💳 Your Balance", value=f"{balance} CF coins", inline=False
         )
-        embed.set_footer(text="Come back in 24 hours for your next daily reward!")
+        embed.set_footer(text=footer)
         embed.set_author(
             name=interaction.user.display_name,
             icon_url=interaction.user.display_avatar.url,
@@ -370,67 +1008,51 @@ class CFCoins(commands.GroupCog, name="cfcoins"):
         await interaction.response.send_message(embed=embed)
 
         logger.info(
-            f"[CF COINS DAILY] {interaction.user} ({interaction.user.id}) "
-            f"claimed {coins} CF coins. New balance: {self.bot.cf_wallet[user_id]}"
-        )
-        
-        await self.log_action(
-            title="💰 Daily Claim",
-            description=f"{interaction.user.mention} claimed their daily reward",
-            color=Color.green(),
+            "[CF COINS %s] %s (%s) claimed %d CF coins. New balance: %d",
+            period.upper(),
+            interaction.user,
+            interaction.user.id,
+            coins,
+            balance,
+        )
+        
+        self._log_async(
+            title=log_title,
+            description=f"{interaction.user.mention} claimed their {period} reward",
+            color=color,
             fields=[
                 {"name": "User", "value": f"{interaction.user.name} ({interaction.user.id})", "inline": True},
                 {"name": "Coins Claimed", "value": f"{coins} CF coins", "inline": True},
-                {"name": "New Balance", "value": f"{self.bot.cf_wallet[user_id]} CF coins", "inline": True}
+                {"name": "New Balance", "value": f"{balance} CF coins", "inline": True}
             ]
         )
 
+    @app_commands.command(name="daily", description="Claim your daily CF coins!")
+    @app_commands.checks.dynamic_cooldown(claim_cooldown(86400), key=lambda i: i.user.id)
+    async def daily(self, interaction: discord.Interaction[BallsDexBot]):
+        await self._claim(
+            interaction,
+            period="daily",
+            low=30,
+            high=60,
+            title="💰 Daily CF Coins Claimed!",
+            color=COLOR_GREEN,
+            footer="Come back in 24 hours for your next daily reward!",
+            log_title="💰 Daily Claim",
+        )
+
     @app_commands.command(name="weekly", description="Claim your weekly CF coins!")
-    @app_commands.checks.cooldown(1, 604800, key=lambda i: i.user.id)
+    @app_commands.checks.dynamic_cooldown(claim_cooldown(604800), key=lambda i: i.user.id)
     async def weekly(self, interaction: discord.Interaction[BallsDexBot]):
-        user_id = str(interaction.user.id)
-
-        min_creation = datetime.now(timezone.utc) - timedelta(days=14)
-        if interaction.user.created_at > min_creation:
-            await interaction.response.send_message(
-                "Your account must be at least 14 days old to use this command.",
-                ephemeral=True,
-            )
-            return
-
-        coins = random.randint(150, 200)
-        self.bot.cf_wallet[user_id] += coins
-
-        embed = Embed(
+        await self._claim(
+            interaction,
+            period="weekly",
+            low=150,
+            high=200,
             title="🎉 Weekly CF Coins Claimed!",
-            description=f"You received **{coins} CF coins**!",
-            color=Color.from_rgb(255, 215, 0),
-        )
-        embed.add_field(
-            name="💳 Your Balance", value=f"{self.bot.cf_wallet[user_id]} CF coins", inline=False
-        )
-        embed.set_footer(text="Come back in 7 days for your next weekly reward!")
-        embed.set_author(
-            name=interaction.user.display_name,
-            icon_url=interaction.user.display_avatar.url,
-        )
-
-        await interaction.response.send_message(embed=embed)
-
-        logger.info(
-            f"[CF COINS WEEKLY] {interaction.user} ({interaction.user.id}) "
-            f"claimed {coins} CF coins. New balance: {self.bot.cf_wallet[user_id]}"
-        )
-        
-        await self.log_action(
-            title="🎉 Weekly Claim",
-            description=f"{interaction.user.mention} claimed their weekly reward",
-            color=Color.from_rgb(255, 215, 0),
-            fields=[
-                {"name": "User", "value": f"{interaction.user.name} ({interaction.user.id})", "inline": True},
-                {"name": "Coins Claimed", "value": f"{coins} CF coins", "inline": True},
-                {"name": "New Balance", "value": f"{self.bot.cf_wallet[user_id]} CF coins", "inline": True}
-            ]
+            color=COLOR_BRIGHT_GOLD,
+            footer="Come back in 7 days for your next weekly reward!",
+            log_title="🎉 Weekly Claim",
         )
 
     @app_commands.command(name="sell", description="Sell a ball for CF coins!")
@@ -441,7 +1063,7 @@ class CFCoins(commands.GroupCog, name="cfcoins"):
         ball: BallInstanceTransform,
         special: SpecialEnabledTransform | None = None,
     ):
-        user_id = str(interaction.user.id)
+        user_id = interaction.user.id
 
         if not ball:
             await interaction.response.send_message(
@@ -449,8 +1071,8 @@ class CFCoins(commands.GroupCog, name="cfcoins"):
             )
             return
 
-        player, _ = await Player.get_or_create(discord_id=user_id)
-        ball_instance = await BallInstance.filter(pk=ball.pk, player=player).prefetch_related("ball").first()
+        player_pk = await self._get_player_pk(user_id)
+        ball_instance = await BallInstance.filter(pk=ball.pk, player_id=player_pk).first()
         
         if not ball_instance:
             await interaction.response.send_message(
@@ -466,17 +1088,17 @@ class CFCoins(commands.GroupCog, name="cfcoins"):
             )
             return
 
-        rarity = ball_instance.ball.rarity
+        rarity = ball_instance.countryball.rarity
         coins = self.calculate_sell_value(rarity)
 
-        ball_name = ball_instance.ball.country
+        ball_name = ball_instance.countryball.country
         ball_id = f"#{ball_instance.pk:0X}"
 
         try:
             await ball_instance.delete()
-        except Exception as e:
-            logger.error(
-                f"[CF COINS SELL ERROR] Failed to delete ball {ball_id} for user {interaction.user.id}: {e}"
+        except Exception:
+            logger.exception(
+                "[CF COINS SELL ERROR] Failed to delete ball %s for user %s", ball_id, user_id
             )
             await interaction.response.send_message(
                 "❌ An error occurred while trying to sell this ball. Please try again later.",
@@ -484,16 +1106,17 @@ class CFCoins(commands.GroupCog, name="cfcoins"):
             )
             return
 
-        self.bot.cf_wallet[user_id] += coins
+        await self._ensure_loaded(user_id)
+        _, balance = self._adjust_coins(user_id, coins)
 
         embed = Embed(
             title="💵 Ball Sold!",
             description=f"You sold **{ball_name}** {ball_id} for **{coins} CF coins**!",
-            color=Color.green(),
+            color=COLOR_GREEN,
         )
         embed.add_field(name="🎯 Rarity", value=f"{rarity}", inline=True)
         embed.add_field(
-            name="💳 New Balance", value=f"{self.bot.cf_wallet[user_id]} CF coins", inline=True
+            name="💳 New Balance", value=f"{balance} CF coins", inline=True
         )
         embed.set_author(
             name=interaction.user.display_name,
@@ -503,50 +1126,58 @@ class CFCoins(commands.GroupCog, name="cfcoins"):
         await interaction.response.send_message(embed=embed)
 
         logger.info(
-            f"[CF COINS SELL] {interaction.user} ({interaction.user.id}) "
-            f"sold {ball_name} (rarity {rarity}) for {coins} CF coins"
+            "[CF COINS SELL] %s (%s) sold %s (rarity %s) for %d CF coins",
+            interaction.user,
+            interaction.user.id,
+            ball_name,
+            rarity,
+            coins,
         )
         
-        await self.log_action(
+        self._log_async(
             title="💵 Ball Sold",
             description=f"{interaction.user.mention} sold a ball",
-            color=Color.green(),
+            color=COLOR_GREEN,
             fields=[
                 {"name": "User", "value": f"{interaction.user.name} ({interaction.user.id})", "inline": True},
                 {"name": "Ball", "value": f"{ball_name} {ball_id}", "inline": True},
                 {"name": "Rarity", "value": f"{rarity}", "inline": True},
                 {"name": "Coins Earned", "value": f"{coins} CF coins", "inline": True},
-                {"name": "New Balance", "value": f"{self.bot.cf_wallet[user_id]} CF coins", "inline": True}
+                {"name": "New Balance", "value": f"{balance} CF coins", "inline": True}
             ]
         )
 
     @app_commands.command(name="bulksell", description="Sell multiple balls at once for CF coins!")
     async def bulksell(self, interaction: discord.Interaction[BallsDexBot]):
-        user_id = str(interaction.user.id)
-        
-        player, _ = await Player.get_or_create(discord_id=user_id)
-        balls = await BallInstance.filter(player=player).prefetch_related("ball")
-        
-        if not balls:
-            await interaction.response.send_message(
-                "❌ You don't have any balls to sell!",
-                ephemeral=True
-            )
-            return
-        
-        non_favorited_balls = [b for b in balls if not b.favorite]
-        if not non_favorited_balls:
-            await interaction.response.send_message(
-                "❌ You don't have any non-favorited balls to sell! All your balls are favorited.",
-                ephemeral=True
-            )
+        user_id = interaction.user.id
+        
+        player_pk = await self._get_player_pk(user_id)
+        # the ball models are read from the bot's cache through countryball, no prefetch needed
+        sellable = BallInstance.filter(player_id=player_pk, favorite=False)
+        total_balls = await sellable.count()
+        await self._ensure_loaded(user_id)
+        
+        if not total_balls:
+            if not await BallInstance.filter(player_id=player_pk).exists():
+                await interaction.response.send_message(
+                    "❌ You don't have any balls to sell!",
+                    ephemeral=True
+                )
+            else:
+                await interaction.response.send_message(
+                    "❌ You don't have any non-favorited balls to sell! "
+                    "All your balls are favorited.",
+                    ephemeral=True
+                )
             return
         
-        view = BulkSellView(self, interaction.user, balls, user_id)
+        # only the first page is loaded, instead of the whole collection
+        page_balls = await sellable.order_by("id").limit(BULK_SELL_PAGE_SIZE)
+        view = BulkSellView(self, interaction.user, player_pk, total_balls, page_balls, user_id)
         embed = Embed(
             title="💰 Bulk Sell",
             description="Select the balls you want to sell.",
-            color=Color.blue()
+            color=COLOR_BLUE
         )
         embed.add_field(
             name="📊 Selected", 
@@ -559,27 +1190,22 @@ class CFCoins(commands.GroupCog, name="cfcoins"):
 
     @app_commands.command(name="wallet", description="Check your CF coins and packs!")
     async def wallet(self, interaction: discord.Interaction[BallsDexBot]):
-        user_id = str(interaction.user.id)
+        user_id = interaction.user.id
+        await self._ensure_loaded(user_id)
 
-        coins = self.bot.cf_wallet[user_id]
-        packs = self.bot.cf_packs[user_id]
+        coins = self._peek_coins(user_id)
+        packs = self._peek_packs(user_id)
 
         embed = Embed(
             title="💼 Your CF Wallet",
             description=f"**💰 CF Coins:** {coins}",
-            color=Color.blue(),
+            color=COLOR_BLUE,
         )
 
-        pack_text = ""
-        total_packs = 0
-        for pack_type, pack_info in PACK_TYPES.items():
-            count = packs[pack_type]
-            total_packs += count
-            if count > 0:
-                pack_text += f"{pack_info['emoji']} **{pack_info['name']}:** {count}\n"
-
-        if not pack_text:
-            pack_text = "No packs owned"
+        pack_text = "\n".join(
+            f"{label}{count}" for label, count in zip(WALLET_PACK_LABELS, packs) if count > 0
+        ) or "No packs owned"
+        total_packs = sum(packs)
 
         embed.add_field(name="📦 Your Packs", value=pack_text, inline=False)
         embed.set_footer(text=f"Total Packs: {total_packs}")
@@ -592,24 +1218,7 @@ class CFCoins(commands.GroupCog, name="cfcoins"):
 
     @app_commands.command(name="shop", description="View the CF coins pack shop!")
     async def shop(self, interaction: discord.Interaction[BallsDexBot]):
-        embed = Embed(
-            title="🏪 CF Coins Pack Shop",
-            description="Purchase packs with your CF coins to get rare balls!",
-            color=Color.gold(),
-        )
-
-        for pack_type, pack_info in PACK_TYPES.items():
-            embed.add_field(
-                name=f"{pack_info['emoji']} {pack_info['name']}",
-                value=(
-                    f"**Price:** {pack_info['price']} CF coins\n"
-                    f"**Rarity Range:** {pack_info['min_rarity']} - {pack_info['max_rarity']}\n"
-                    f"Use `/cfcoins buy {pack_type}` to purchase!"
-                ),
-                inline=False,
-            )
-
-        embed.set_footer(text="Use /cfcoins buy <pack_type> to purchase a pack!")
+        embed = self._shop_embed.copy()
         embed.set_author(
             name=interaction.user.display_name,
             icon_url=interaction.user.display_avatar.url,
@@ -630,44 +1239,43 @@ class CFCoins(commands.GroupCog, name="cfcoins"):
         ]
     )
     async def buy(self, interaction: discord.Interaction[BallsDexBot], pack_type: str):
-        user_id = str(interaction.user.id)
+        user_id = interaction.user.id
 
-        if pack_type not in PACK_TYPES:
-            await interaction.response.send_message(
-                "Invalid pack type! Choose: normal, epic, mythic, or legendary.",
-                ephemeral=True,
-            )
-            return
+        pack = PACK_TYPE_INDEXES[pack_type]
+        pack_info = PACK_INFOS[pack]
+        price = pack_info.price
 
-        pack_info = PACK_TYPES[pack_type]
-        price = pack_info["price"]
+        await self._ensure_loaded(user_id)
 
-        if self.bot.cf_wallet[user_id] < price:
+        balance = self._try_debit(user_id, price)
+        if balance is None:
             await interaction.response.send_message(
-                f"❌ You don't have enough CF coins! You need **{price}** CF coins but only have **{self.bot.cf_wallet[user_id]}**.",
+                BUY_NOT_ENOUGH_COINS_MESSAGE.format(price, self._peek_coins(user_id)),
                 ephemeral=True,
             )
             return
 
-        self.bot.cf_wallet[user_id] -= price
-        self.bot.cf_packs[user_id][pack_type] += 1
+        packs = self._get_packs(user_id)
+        pack_count = packs[pack] + 1
+        packs[pack] = pack_count
+        self._mark_dirty(user_id)
 
         embed = Embed(
             title="🎉 Pack Purchased!",
-            description=f"You bought a **{pack_info['name']}** {pack_info['emoji']}!",
-            color=pack_info["color"],
+            description=f"You bought a **{pack_info.name}** {pack_info.emoji}!",
+            color=pack_info.color,
         )
         embed.add_field(
-            name="💰 Price Paid", value=f"{price} CF coins", inline=True
+            name="💰 Price Paid", value=pack_info.price_str, inline=True
         )
         embed.add_field(
             name="💳 Remaining Balance",
-            value=f"{self.bot.cf_wallet[user_id]} CF coins",
+            value=f"{balance} CF coins",
             inline=True,
         )
         embed.add_field(
             name="📦 Total Packs of This Type",
-            value=f"{self.bot.cf_packs[user_id][pack_type]}",
+            value=f"{pack_count}",
             inline=False,
         )
         embed.set_footer(text="Use /cfcoins open to open your pack!")
@@ -679,20 +1287,23 @@ class CFCoins(commands.GroupCog, name="cfcoins"):
         await interaction.response.send_message(embed=embed)
 
         logger.info(
-            f"[CF COINS BUY] {interaction.user} ({interaction.user.id}) "
-            f"bought {pack_info['name']} for {price} CF coins"
+            "[CF COINS BUY] %s (%s) bought %s for %d CF coins",
+            interaction.user,
+            interaction.user.id,
+            pack_info.name,
+            price,
         )
         
-        await self.log_action(
+        self._log_async(
             title="🎉 Pack Purchased",
             description=f"{interaction.user.mention} bought a pack",
-            color=pack_info["color"],
+            color=pack_info.color,
             fields=[
                 {"name": "User", "value": f"{interaction.user.name} ({interaction.user.id})", "inline": True},
-                {"name": "Pack Type", "value": f"{pack_info['emoji']} {pack_info['name']}", "inline": True},
-                {"name": "Price Paid", "value": f"{price} CF coins", "inline": True},
-                {"name": "Remaining Balance", "value": f"{self.bot.cf_wallet[user_id]} CF coins", "inline": True},
-                {"name": "Total Packs of This Type", "value": f"{self.bot.cf_packs[user_id][pack_type]}", "inline": True}
+                {"name": "Pack Type", "value": pack_info.display, "inline": True},
+                {"name": "Price Paid", "value": pack_info.price_str, "inline": True},
+                {"name": "Remaining Balance", "value": f"{balance} CF coins", "inline": True},
+                {"name": "Total Packs of This Type", "value": f"{pack_count}", "inline": True}
             ]
         )
 
@@ -709,167 +1320,151 @@ class CFCoins(commands.GroupCog, name="cfcoins"):
         ]
     )
     async def open(self, interaction: discord.Interaction[BallsDexBot], pack_type: str):
-        user_id = str(interaction.user.id)
+        user_id = interaction.user.id
 
-        if pack_type not in PACK_TYPES:
-            await interaction.response.send_message(
-                "Invalid pack type! Choose: normal, epic, mythic, or legendary.",
-                ephemeral=True,
-            )
-            return
+        pack = PACK_TYPE_INDEXES[pack_type]
 
-        if self.bot.cf_packs[user_id][pack_type] < 1:
+        await self._ensure_loaded(user_id)
+        if self._peek_packs(user_id)[pack] < 1:
             await interaction.response.send_message(
-                f"❌ You don't have any {PACK_TYPES[pack_type]['name']}s to open!",
+                NO_PACK_MESSAGE.format(PACK_INFOS[pack].name, "open"),
                 ephemeral=True,
             )
             return
 
-        pack_info = PACK_TYPES[pack_type]
-
-        player, _ = await Player.get_or_create(discord_id=str(interaction.user.id))
-        ball = await self.get_random_ball_in_range(
-            pack_info["min_rarity"], pack_info["max_rarity"]
-        )
+        pack_info = PACK_INFOS[pack]
 
-        if not ball:
+        if self._get_alias_table(pack_info.min_rarity, pack_info.max_rarity) is None:
             await interaction.response.send_message(
                 "❌ No balls are available in this rarity range. Your pack was not consumed.",
                 ephemeral=True,
             )
             return
 
-        self.bot.cf_packs[user_id][pack_type] -= 1
-
-        instance = await BallInstance.create(
-            ball=ball,
-            player=player,
-            attack_bonus=random.randint(-20, 20),
-            health_bonus=random.randint(-20, 20),
-        )
+        self._get_packs(user_id)[pack] -= 1
+        self._mark_dirty(user_id)
 
-        walkout_embed = Embed(
-            title=f"{pack_info['emoji']} Opening {pack_info['name']}...",
-            color=Color.dark_gray(),
-        )
-        walkout_embed.set_footer(text="CF Coins Pack System")
+        # acknowledge before any database work, the rest can take as long as needed
         await interaction.response.defer()
-        msg = await interaction.followup.send(embed=walkout_embed)
-
-        await asyncio.sleep(1.5)
-        walkout_embed.description = f"✨ **Rarity:** `{ball.rarity}`"
-        await msg.edit(embed=walkout_embed)
-
-        await asyncio.sleep(1.5)
-        regime_name = ball.cached_regime.name if ball.cached_regime else "Unknown"
-        walkout_embed.description += f"\n💳 **Card:** **{regime_name}**"
-        await msg.edit(embed=walkout_embed)
-
-        await asyncio.sleep(1.5)
-        walkout_embed.description += (
-            f"\n💖 **Health:** `{instance.health}`\n⚽ **Attack:** `{instance.attack}`"
+        await self._reveal_pack(
+            interaction,
+            pack_info,
+            action="opened",
+            refund=lambda: self._adjust_packs(user_id, pack, 1),
         )
-        await msg.edit(embed=walkout_embed)
 
-        await asyncio.sleep(1.5)
-        walkout_embed.title = f"🎁 You got **{ball.country}**!"
-        walkout_embed.color = pack_info["color"]
-
-        content, file, view = await instance.prepare_for_message(interaction)
-        walkout_embed.set_image(url="attachment://" + file.filename)
-        walkout_embed.set_author(
-            name=interaction.user.display_name,
-            icon_url=interaction.user.display_avatar.url,
-        )
+    @app_commands.command(
+        name="buyopen", description="Buy a pack with CF coins and open it right away!"
+    )
+    @app_commands.describe(
+        pack_type="The type of pack to buy and open (normal, epic, mythic, legendary)"
+    )
+    @app_commands.choices(
+        pack_type=[
+            app_commands.Choice(name="Normal Pack (250 coins)", value="normal"),
+            app_commands.Choice(name="Epic Pack (500 coins)", value="epic"),
+            app_commands.Choice(name="Mythic Pack (1500 coins)", value="mythic"),
+            app_commands.Choice(name="Legendary Pack (5000 coins)", value="legendary"),
+        ]
+    )
+    async def buyopen(self, interaction: discord.Interaction[BallsDexBot], pack_type: str):
+        user_id = interaction.user.id
 
-        await msg.edit(embed=walkout_embed, attachments=[file], view=view)
-        file.close()
+        pack_info = PACK_INFOS[PACK_TYPE_INDEXES[pack_type]]
 
-        logger.info(
-            f"[CF COINS OPEN] {interaction.user} ({interaction.user.id}) "
-            f"opened {pack_info['name']} and got {ball.country} (rarity {ball.rarity})"
-        )
-        
-        await self.log_action(
-            title="🎁 Pack Opened",
-            description=f"{interaction.user.mention} opened a pack",
-            color=pack_info["color"],
-            fields=[
-                {"name": "User", "value": f"{interaction.user.name} ({interaction.user.id})", "inline": True},
-                {"name": "Pack Type", "value": f"{pack_info['emoji']} {pack_info['name']}", "inline": True},
-                {"name": "Ball Received", "value": f"{ball.country}", "inline": True},
-                {"name": "Rarity", "value": f"{ball.rarity}", "inline": True},
-                {"name": "Health", "value": f"{instance.health}", "inline": True},
-                {"name": "Attack", "value": f"{instance.attack}", "inline": True}
-            ]
-        )
-
-    @app_commands.command(name="giftcoins", description="Gift CF coins to another user!")
-    @app_commands.describe(user="The user to gift coins to", amount="Amount of CF coins to gift")
-    async def giftcoins(self, interaction: discord.Interaction[BallsDexBot], user: discord.User, amount: int):
-        sender_id = str(interaction.user.id)
-        receiver_id = str(user.id)
-        
-        if user.id == interaction.user.id:
+        if self._get_alias_table(pack_info.min_rarity, pack_info.max_rarity) is None:
             await interaction.response.send_message(
-                "❌ You cannot gift coins to yourself!",
-                ephemeral=True
+                "❌ No balls are available in this rarity range. You were not charged.",
+                ephemeral=True,
             )
             return
-        
-        if user.bot:
+
+        await self._ensure_loaded(user_id)
+        if self._try_debit(user_id, pack_info.price) is None:
             await interaction.response.send_message(
-                "❌ You cannot gift coins to a bot!",
-                ephemeral=True
+                BUY_NOT_ENOUGH_COINS_MESSAGE.format(pack_info.price, self._peek_coins(user_id)),
+                ephemeral=True,
             )
             return
+
+        # the pack never goes through the inventory, the price is the only wallet change
+        await interaction.response.defer()
+        await self._reveal_pack(
+            interaction,
+            pack_info,
+            action="bought and opened",
+            refund=lambda: self._adjust_coins(user_id, pack_info.price),
+        )
+
+    @app_commands.command(name="giftcoins", description="Gift CF coins to another user!")
+    @app_commands.describe(user="The user to gift coins to", amount="Amount of CF coins to gift")
+    async def giftcoins(
+        self,
+        interaction: discord.Interaction[BallsDexBot],
+        user: discord.User,
+        amount: app_commands.Range[int, 1],
+    ):
+        sender = interaction.user
+        sender_id = sender.id
+        receiver_id = user.id
         
-        if amount <= 0:
-            await interaction.response.send_message(
-                "❌ You must gift at least 1 CF coin!",
-                ephemeral=True
-            )
+        if not await self._check_gift_receiver(interaction, user, "coins"):
             return
         
-        if self.bot.cf_wallet[sender_id] < amount:
+        await self._ensure_loaded(sender_id, receiver_id)
+        sender_balance = self._try_debit(sender_id, amount)
+        if sender_balance is None:
             await interaction.response.send_message(
-                f"❌ You don't have enough CF coins! You have **{self.bot.cf_wallet[sender_id]}** CF coins but tried to gift **{amount}**.",
+                GIFT_NOT_ENOUGH_COINS_MESSAGE.format(self._peek_coins(sender_id), amount),
                 ephemeral=True
             )
             return
         
-        self.bot.cf_wallet[sender_id] -= amount
-        self.bot.cf_wallet[receiver_id] += amount
+        _, receiver_balance = self._adjust_coins(receiver_id, amount)
         
-        embed = Embed(
-            title="💝 Coins Gifted!",
-            description=f"You gifted **{amount} CF coins** to {user.mention}!",
-            color=Color.green()
-        )
-        embed.add_field(name="💳 Your New Balance", value=f"{self.bot.cf_wallet[sender_id]} CF coins", inline=False)
-        embed.set_author(
-            name=interaction.user.display_name,
-            icon_url=interaction.user.display_avatar.url
+        embed = Embed.from_dict(
+            {
+                "title": "💝 Coins Gifted!",
+                "description": f"You gifted **{amount} CF coins** to {user.mention}!",
+                "color": COLOR_GREEN.value,
+                "fields": [
+                    {
+                        "name": "💳 Your New Balance",
+                        "value": f"{sender_balance} CF coins",
+                        "inline": False,
+                    }
+                ],
+                "author": {"name": sender.display_name, "icon_url": sender.display_avatar.url},
+            }
         )
         
         await interaction.response.send_message(embed=embed)
         
         logger.info(
-            f"[CF COINS GIFT] {interaction.user} ({interaction.user.id}) "
-            f"gifted {amount} CF coins to {user} ({user.id})"
+            "[CF COINS GIFT] %s (%s) gifted %d CF coins to %s (%s)",
+            sender,
+            sender_id,
+            amount,
+            user,
+            receiver_id,
         )
         
-        await self.log_action(
+        self._log_async(
             title="💝 Coins Gifted",
-            description=f"{interaction.user.mention} gifted coins to {user.mention}",
-            color=Color.green(),
-            fields=[
-                {"name": "Sender", "value": f"{interaction.user.name} ({interaction.user.id})", "inline": True},
-                {"name": "Receiver", "value": f"{user.name} ({user.id})", "inline": True},
-                {"name": "Amount", "value": f"{amount} CF coins", "inline": True},
-                {"name": "Sender New Balance", "value": f"{self.bot.cf_wallet[sender_id]} CF coins", "inline": True},
-                {"name": "Receiver New Balance", "value": f"{self.bot.cf_wallet[receiver_id]} CF coins", "inline": True}
-            ]
+            description=f"{sender.mention} gifted coins to {user.mention}",
+            color=COLOR_GREEN,
+            fields=inline_fields(
+                GIFT_COINS_LOG_FIELDS,
+                {
+                    "sender_name": sender.name,
+                    "sender_id": sender_id,
+                    "receiver_name": user.name,
+                    "receiver_id": receiver_id,
+                    "amount": amount,
+                    "sender_balance": sender_balance,
+                    "receiver_balance": receiver_balance,
+                },
+            ),
         )
 
     @app_commands.command(name="giftpacks", description="Gift a pack to another user!")
@@ -886,180 +1481,340 @@ class CFCoins(commands.GroupCog, name="cfcoins"):
         ]
     )
     async def giftpacks(self, interaction: discord.Interaction[BallsDexBot], user: discord.User, pack_type: str):
-        sender_id = str(interaction.user.id)
-        receiver_id = str(user.id)
-        
-        if user.id == interaction.user.id:
-            await interaction.response.send_message(
-                "❌ You cannot gift packs to yourself!",
-                ephemeral=True
-            )
-            return
+        sender = interaction.user
+        sender_id = sender.id
+        receiver_id = user.id
         
-        if user.bot:
-            await interaction.response.send_message(
-                "❌ You cannot gift packs to a bot!",
-                ephemeral=True
-            )
+        if not await self._check_gift_receiver(interaction, user, "packs"):
             return
         
-        if pack_type not in PACK_TYPES:
-            await interaction.response.send_message(
-                "Invalid pack type! Choose: normal, epic, mythic, or legendary.",
-                ephemeral=True
-            )
-            return
+        pack = PACK_TYPE_INDEXES[pack_type]
         
-        if self.bot.cf_packs[sender_id][pack_type] < 1:
+        await self._ensure_loaded(sender_id, receiver_id)
+        sender_packs = self._peek_packs(sender_id)
+        if sender_packs[pack] < 1:
             await interaction.response.send_message(
-                f"❌ You don't have any {PACK_TYPES[pack_type]['name']}s to gift!",
+                NO_PACK_MESSAGE.format(PACK_INFOS[pack].name, "gift"),
                 ephemeral=True
             )
             return
         
-        pack_info = PACK_TYPES[pack_type]
+        pack_info = PACK_INFOS[pack]
         
-        self.bot.cf_packs[sender_id][pack_type] -= 1
-        self.bot.cf_packs[receiver_id][pack_type] += 1
+        _, sender_count = self._adjust_packs(sender_id, pack, -1)
+        _, receiver_count = self._adjust_packs(receiver_id, pack, 1)
         
-        embed = Embed(
-            title="🎁 Pack Gifted!",
-            description=f"You gifted a **{pack_info['name']}** {pack_info['emoji']} to {user.mention}!",
-            color=pack_info["color"]
-        )
-        embed.add_field(
-            name="📦 Your Remaining Packs",
-            value=f"{self.bot.cf_packs[sender_id][pack_type]} {pack_info['name']}s",
-            inline=False
-        )
-        embed.set_author(
-            name=interaction.user.display_name,
-            icon_url=interaction.user.display_avatar.url
+        embed = Embed.from_dict(
+            {
+                "title": "🎁 Pack Gifted!",
+                "description": (
+                    f"You gifted a **{pack_info.name}** {pack_info.emoji} to {user.mention}!"
+                ),
+                "color": pack_info.color.value,
+                "fields": [
+                    {
+                        "name": "📦 Your Remaining Packs",
+                        "value": f"{sender_count} {pack_info.name}s",
+                        "inline": False,
+                    }
+                ],
+                "author": {"name": sender.display_name, "icon_url": sender.display_avatar.url},
+            }
         )
         
         await interaction.response.send_message(embed=embed)
         
         logger.info(
-            f"[CF COINS GIFT PACK] {interaction.user} ({interaction.user.id}) "
-            f"gifted {pack_info['name']} to {user} ({user.id})"
+            "[CF COINS GIFT PACK] %s (%s) gifted %s to %s (%s)",
+            sender,
+            sender_id,
+            pack_info.name,
+            user,
+            receiver_id,
         )
         
-        await self.log_action(
+        self._log_async(
             title="🎁 Pack Gifted",
-            description=f"{interaction.user.mention} gifted a pack to {user.mention}",
-            color=pack_info["color"],
-            fields=[
-                {"name": "Sender", "value": f"{interaction.user.name} ({interaction.user.id})", "inline": True},
-                {"name": "Receiver", "value": f"{user.name} ({user.id})", "inline": True},
-                {"name": "Pack Type", "value": f"{pack_info['emoji']} {pack_info['name']}", "inline": True},
-                {"name": "Sender Remaining Packs", "value": f"{self.bot.cf_packs[sender_id][pack_type]}", "inline": True},
-                {"name": "Receiver Total Packs", "value": f"{self.bot.cf_packs[receiver_id][pack_type]}", "inline": True}
-            ]
+            description=f"{sender.mention} gifted a pack to {user.mention}",
+            color=pack_info.color,
+            fields=inline_fields(
+                GIFT_PACKS_LOG_FIELDS,
+                {
+                    "sender_name": sender.name,
+                    "sender_id": sender_id,
+                    "receiver_name": user.name,
+                    "receiver_id": receiver_id,
+                    "pack": pack_info.display,
+                    "sender_count": sender_count,
+                    "receiver_count": receiver_count,
+                },
+            ),
+        )
+
+    async def _reveal_pack(
+        self,
+        interaction: discord.Interaction[BallsDexBot],
+        pack_info: PackInfo,
+        *,
+        action: str,
+        refund: Callable[[], object],
+    ):
+        """
+        Create the ball of an already paid pack and play the walkout animation.
+        The interaction must already be deferred. ``refund`` gives the payment back if the ball
+        cannot be created.
+        """
+        user_id = interaction.user.id
+
+        walkout_embed = Embed(
+            title=f"{pack_info.emoji} Opening {pack_info.name}...",
+            color=COLOR_DARK_GRAY,
         )
+        walkout_embed.set_footer(text="CF Coins Pack System")
 
-    @app_commands.command(name="adminaddcoins", description="[ADMIN] Add CF coins to a user")
-    @app_commands.describe(user="The user to add coins to", amount="Amount of CF coins to add")
-    async def adminaddcoins(self, interaction: discord.Interaction[BallsDexBot], user: discord.User, amount: int):
-        if interaction.user.id not in ADMIN_IDS:
-            await interaction.response.send_message(
-                "❌ You don't have permission to use this command!",
-                ephemeral=True
-            )
-            return
-        
-        if amount <= 0:
-            await interaction.response.send_message(
-                "❌ Amount must be greater than 0!",
-                ephemeral=True
+        async def create_instance() -> BallInstance | None:
+            player_pk = await self._get_player_pk(user_id)
+            instances = await self._open_packs(player_pk, pack_info)
+            return instances[0] if instances else None
+
+        # the walkout message does not depend on the database, send both at once
+        msg, instance = await asyncio.gather(
+            interaction.followup.send(embed=walkout_embed),
+            create_instance(),
+            return_exceptions=True,
+        )
+        if not isinstance(instance, BallInstance):
+            # the pack is already paid for, give it back before anything else
+            await self._ensure_loaded(user_id)
+            refund()
+            if isinstance(instance, BaseException) and not isinstance(instance, Exception):
+                raise instance
+            logger.error(
+                "Failed to create the ball of a %s %s by %s (%s), refunded",
+                pack_info.name,
+                action,
+                interaction.user,
+                user_id,
+                exc_info=instance,
             )
+            if isinstance(msg, BaseException):
+                await interaction.followup.send(PACK_OPEN_FAILED_MESSAGE, ephemeral=True)
+            else:
+                await msg.edit(content=PACK_OPEN_FAILED_MESSAGE, embed=None)
             return
-        
-        user_id = str(user.id)
-        old_balance = self.bot.cf_wallet[user_id]
-        self.bot.cf_wallet[user_id] += amount
-        new_balance = self.bot.cf_wallet[user_id]
-        
-        embed = Embed(
-            title="✅ Coins Added",
-            description=f"Added **{amount} CF coins** to {user.mention}",
-            color=Color.green()
-        )
-        embed.add_field(name="Old Balance", value=f"{old_balance} CF coins", inline=True)
-        embed.add_field(name="New Balance", value=f"{new_balance} CF coins", inline=True)
-        embed.set_footer(text=f"Admin: {interaction.user.name}")
-        
-        await interaction.response.send_message(embed=embed, ephemeral=True)
-        
-        logger.info(
-            f"[CF COINS ADMIN ADD] {interaction.user} ({interaction.user.id}) "
-            f"added {amount} CF coins to {user} ({user.id})"
-        )
-        
-        await self.log_action(
-            title="🔧 Admin: Coins Added",
-            description=f"Admin {interaction.user.mention} added coins to {user.mention}",
-            color=Color.orange(),
-            fields=[
-                {"name": "Admin", "value": f"{interaction.user.name} ({interaction.user.id})", "inline": True},
-                {"name": "Target User", "value": f"{user.name} ({user.id})", "inline": True},
-                {"name": "Amount Added", "value": f"{amount} CF coins", "inline": True},
-                {"name": "Old Balance", "value": f"{old_balance} CF coins", "inline": True},
-                {"name": "New Balance", "value": f"{new_balance} CF coins", "inline": True}
-            ]
+        if isinstance(msg, BaseException):
+            raise msg
+        ball = instance.countryball
+
+        # render the card while the walkout animation plays
+        prepare = asyncio.create_task(self._render_card(instance, interaction))
+
+        # the card is rendered during the walkout, the reveal is a single edit
+        await asyncio.sleep(OPEN_WALKOUT_DELAY)
+        regime_name = ball.cached_regime.name if ball.cached_regime else "Unknown"
+        walkout_embed.description = (
+            f"✨ **Rarity:** `{ball.rarity}`\n💳 **Card:** **{regime_name}**\n"
+            f"💖 **Health:** `{instance.health}`\n⚽ **Attack:** `{instance.attack}`"
         )
+        walkout_embed.title = f"🎁 You got **{ball.country}**!"
+        walkout_embed.color = pack_info.color
 
-    @app_commands.command(name="adminremovecoins", description="[ADMIN] Remove CF coins from a user")
-    @app_commands.describe(user="The user to remove coins from", amount="Amount of CF coins to remove")
-    async def adminremovecoins(self, interaction: discord.Interaction[BallsDexBot], user: discord.User, amount: int):
-        if interaction.user.id not in ADMIN_IDS:
-            await interaction.response.send_message(
-                "❌ You don't have permission to use this command!",
-                ephemeral=True
-            )
-            return
-        
-        if amount <= 0:
-            await interaction.response.send_message(
-                "❌ Amount must be greater than 0!",
-                ephemeral=True
-            )
-            return
-        
-        user_id = str(user.id)
-        old_balance = self.bot.cf_wallet[user_id]
-        self.bot.cf_wallet[user_id] = max(0, self.bot.cf_wallet[user_id] - amount)
-        new_balance = self.bot.cf_wallet[user_id]
-        
-        embed = Embed(
-            title="✅ Coins Removed",
-            description=f"Removed **{amount} CF coins** from {user.mention}",
-            color=Color.red()
+        content, file, view = await prepare
+        walkout_embed.set_image(url="attachment://" + file.filename)
+        walkout_embed.set_author(
+            name=interaction.user.display_name,
+            icon_url=interaction.user.display_avatar.url,
         )
-        embed.add_field(name="Old Balance", value=f"{old_balance} CF coins", inline=True)
-        embed.add_field(name="New Balance", value=f"{new_balance} CF coins", inline=True)
-        embed.set_footer(text=f"Admin: {interaction.user.name}")
-        
-        await interaction.response.send_message(embed=embed, ephemeral=True)
-        
+
+        try:
+            await msg.edit(embed=walkout_embed, attachments=[file], view=view)
+        finally:
+            file.close()
+
         logger.info(
-            f"[CF COINS ADMIN REMOVE] {interaction.user} ({interaction.user.id}) "
-            f"removed {amount} CF coins from {user} ({user.id})"
+            "[CF COINS OPEN] %s (%s) %s %s and got %s (rarity %s)",
+            interaction.user,
+            interaction.user.id,
+            action,
+            pack_info.name,
+            ball.country,
+            ball.rarity,
         )
         
-        await self.log_action(
-            title="🔧 Admin: Coins Removed",
-            description=f"Admin {interaction.user.mention} removed coins from {user.mention}",
-            color=Color.red(),
+        self._log_async(
+            title="🎁 Pack Opened",
+            description=f"{interaction.user.mention} {action} a pack",
+            color=pack_info.color,
             fields=[
-                {"name": "Admin", "value": f"{interaction.user.name} ({interaction.user.id})", "inline": True},
-                {"name": "Target User", "value": f"{user.name} ({user.id})", "inline": True},
-                {"name": "Amount Removed", "value": f"{amount} CF coins", "inline": True},
-                {"name": "Old Balance", "value": f"{old_balance} CF coins", "inline": True},
-                {"name": "New Balance", "value": f"{new_balance} CF coins", "inline": True}
+                {
+                    "name": "User",
+                    "value": f"{interaction.user.name} ({interaction.user.id})",
+                    "inline": True,
+                },
+                {"name": "Pack Type", "value": pack_info.display, "inline": True},
+                {"name": "Ball Received", "value": f"{ball.country}", "inline": True},
+                {"name": "Rarity", "value": f"{ball.rarity}", "inline": True},
+                {"name": "Health", "value": f"{instance.health}", "inline": True},
+                {"name": "Attack", "value": f"{instance.attack}", "inline": True}
             ]
         )
 
-    @app_commands.command(name="adminaddpacks", description="[ADMIN] Add packs to a user")
+    async def _check_gift_receiver(
+        self, interaction: discord.Interaction[BallsDexBot], user: discord.User, what: str
+    ) -> bool:
+        """
+        Validation shared by the gift commands, replying with the error and returning ``False``
+        if ``user`` cannot receive gifts from the author.
+        """
+        if user.id == interaction.user.id:
+            error = GIFT_SELF_MESSAGE.format(what)
+        elif user.bot:
+            error = GIFT_BOT_MESSAGE.format(what)
+        else:
+            return True
+        await interaction.response.send_message(error, ephemeral=True)
+        return False
+
+    async def _admin_apply(
+        self,
+        interaction: discord.Interaction[BallsDexBot],
+        user: discord.User,
+        amount: int,
+        *,
+        kind: Literal["coins", "packs"],
+        op: Literal["add", "remove"],
+        pack_type: str | None = None,
+    ):
+        """
+        Shared body of the admin commands giving or taking coins or packs from a user.
+
+        Permissions are checked by `CFCoinsAdmin.interaction_check` and Discord only accepts
+        positive amounts.
+        """
+        admin = interaction.user
+        admin_id = admin.id
+        pack = PACK_TYPE_INDEXES[pack_type] if kind == "packs" else None
+
+        # loading the wallet may hit the database, don't risk the 3 seconds deadline
+        await interaction.response.defer(ephemeral=True)
+
+        verb, preposition, color, log_color, log_fields = ADMIN_ACTIONS[kind, op]
+        delta = amount if op == "add" else -amount
+        user_id = user.id
+        user_name = user.name
+        user_mention = user.mention
+        admin_name = admin.name
+        await self._ensure_loaded(user_id)
+        if pack is None:
+            old, new = self._adjust_coins(user_id, delta)
+            unit = "CF coins"
+            label = "Balance"
+            item = "CF coins"
+            given = f"**{amount} {item}**"
+            pack_display = None
+        else:
+            pack_info = PACK_INFOS[pack]
+            old, new = self._adjust_packs(user_id, pack, delta)
+            unit = "packs"
+            label = "Amount"
+            item = f"{pack_info.name}s"
+            given = f"**{amount} {item}** {pack_info.emoji}"
+            pack_display = pack_info.display
+            color = color or pack_info.color
+
+        embed = Embed.from_dict(
+            {
+                "title": f"✅ {kind.capitalize()} {verb}",
+                "description": f"{verb} {given} {preposition} {user_mention}",
+                "color": color.value,
+                "fields": [
+                    {"name": f"Old {label}", "value": f"{old} {unit}", "inline": True},
+                    {"name": f"New {label}", "value": f"{new} {unit}", "inline": True},
+                ],
+                "footer": {"text": f"Admin: {admin_name}"},
+            }
+        )
+
+        await interaction.followup.send(embed=embed, ephemeral=True)
+
+        logger.info(
+            "[CF COINS ADMIN %s%s] %s (%s) %s %d %s %s %s (%s)",
+            op.upper(),
+            " PACKS" if pack is not None else "",
+            admin,
+            admin_id,
+            verb.lower(),
+            amount,
+            item,
+            preposition,
+            user,
+            user_id,
+        )
+
+        self._log_async(
+            title=f"🔧 Admin: {kind.capitalize()} {verb}",
+            description=(
+                f"Admin {admin.mention} {verb.lower()} {kind} "
+                f"{preposition} {user_mention}"
+            ),
+            color=log_color,
+            fields=inline_fields(
+                log_fields,
+                {
+                    "admin_name": admin_name,
+                    "admin_id": admin_id,
+                    "user_name": user_name,
+                    "user_id": user_id,
+                    "pack": pack_display,
+                    "amount": amount,
+                    "old": old,
+                    "new": new,
+                },
+            ),
+        )
+
+
+@app_commands.default_permissions(administrator=True)
+class CFCoinsAdmin(commands.GroupCog, name="cfadmin"):
+    """
+    Admin commands editing the CF coins and packs of users.
+
+    Kept out of the cfcoins group so that Discord hides them from non-administrators,
+    default permissions only apply to top-level commands.
+    """
+
+    def __init__(self, cfcoins: CFCoins):
+        self.cfcoins = cfcoins
+
+    async def interaction_check(self, interaction: discord.Interaction[BallsDexBot]) -> bool:
+        if interaction.user.id not in ADMIN_IDS:
+            await interaction.response.send_message(NO_PERMISSION_MESSAGE, ephemeral=True)
+            return False
+        return True
+
+    @app_commands.command(name="addcoins", description="Add CF coins to a user")
+    @app_commands.describe(user="The user to add coins to", amount="Amount of CF coins to add")
+    async def addcoins(
+        self,
+        interaction: discord.Interaction[BallsDexBot],
+        user: discord.User,
+        amount: app_commands.Range[int, 1, ADMIN_MAX_AMOUNT],
+    ):
+        await self.cfcoins._admin_apply(interaction, user, amount, kind="coins", op="add")
+
+    @app_commands.command(name="removecoins", description="Remove CF coins from a user")
+    @app_commands.describe(
+        user="The user to remove coins from", amount="Amount of CF coins to remove"
+    )
+    async def removecoins(
+        self,
+        interaction: discord.Interaction[BallsDexBot],
+        user: discord.User,
+        amount: app_commands.Range[int, 1, ADMIN_MAX_AMOUNT],
+    ):
+        await self.cfcoins._admin_apply(interaction, user, amount, kind="coins", op="remove")
+
+    @app_commands.command(name="addpacks", description="Add packs to a user")
     @app_commands.describe(
         user="The user to add packs to",
         pack_type="The type of pack to add",
@@ -1073,65 +1828,18 @@ class CFCoins(commands.GroupCog, name="cfcoins"):
             app_commands.Choice(name="Legendary Pack", value="legendary"),
         ]
     )
-    async def adminaddpacks(self, interaction: discord.Interaction[BallsDexBot], user: discord.User, pack_type: str, amount: int):
-        if interaction.user.id not in ADMIN_IDS:
-            await interaction.response.send_message(
-                "❌ You don't have permission to use this command!",
-                ephemeral=True
-            )
-            return
-        
-        if pack_type not in PACK_TYPES:
-            await interaction.response.send_message(
-                "Invalid pack type!",
-                ephemeral=True
-            )
-            return
-        
-        if amount <= 0:
-            await interaction.response.send_message(
-                "❌ Amount must be greater than 0!",
-                ephemeral=True
-            )
-            return
-        
-        user_id = str(user.id)
-        pack_info = PACK_TYPES[pack_type]
-        old_amount = self.bot.cf_packs[user_id][pack_type]
-        self.bot.cf_packs[user_id][pack_type] += amount
-        new_amount = self.bot.cf_packs[user_id][pack_type]
-        
-        embed = Embed(
-            title="✅ Packs Added",
-            description=f"Added **{amount} {pack_info['name']}s** {pack_info['emoji']} to {user.mention}",
-            color=pack_info["color"]
-        )
-        embed.add_field(name="Old Amount", value=f"{old_amount} packs", inline=True)
-        embed.add_field(name="New Amount", value=f"{new_amount} packs", inline=True)
-        embed.set_footer(text=f"Admin: {interaction.user.name}")
-        
-        await interaction.response.send_message(embed=embed, ephemeral=True)
-        
-        logger.info(
-            f"[CF COINS ADMIN ADD PACKS] {interaction.user} ({interaction.user.id}) "
-            f"added {amount} {pack_info['name']}s to {user} ({user.id})"
-        )
-        
-        await self.log_action(
-            title="🔧 Admin: Packs Added",
-            description=f"Admin {interaction.user.mention} added packs to {user.mention}",
-            color=Color.orange(),
-            fields=[
-                {"name": "Admin", "value": f"{interaction.user.name} ({interaction.user.id})", "inline": True},
-                {"name": "Target User", "value": f"{user.name} ({user.id})", "inline": True},
-                {"name": "Pack Type", "value": f"{pack_info['emoji']} {pack_info['name']}", "inline": True},
-                {"name": "Amount Added", "value": f"{amount} packs", "inline": True},
-                {"name": "Old Amount", "value": f"{old_amount} packs", "inline": True},
-                {"name": "New Amount", "value": f"{new_amount} packs", "inline": True}
-            ]
+    async def addpacks(
+        self,
+        interaction: discord.Interaction[BallsDexBot],
+        user: discord.User,
+        pack_type: str,
+        amount: app_commands.Range[int, 1, ADMIN_MAX_AMOUNT],
+    ):
+        await self.cfcoins._admin_apply(
+            interaction, user, amount, kind="packs", op="add", pack_type=pack_type
         )
 
-    @app_commands.command(name="adminremovepacks", description="[ADMIN] Remove packs from a user")
+    @app_commands.command(name="removepacks", description="Remove packs from a user")
     @app_commands.describe(
         user="The user to remove packs from",
         pack_type="The type of pack to remove",
@@ -1145,64 +1853,19 @@ class CFCoins(commands.GroupCog, name="cfcoins"):
             app_commands.Choice(name="Legendary Pack", value="legendary"),
         ]
     )
-    async def adminremovepacks(self, interaction: discord.Interaction[BallsDexBot], user: discord.User, pack_type: str, amount: int):
-        if interaction.user.id not in ADMIN_IDS:
-            await interaction.response.send_message(
-                "❌ You don't have permission to use this command!",
-                ephemeral=True
-            )
-            return
-        
-        if pack_type not in PACK_TYPES:
-            await interaction.response.send_message(
-                "Invalid pack type!",
-                ephemeral=True
-            )
-            return
-        
-        if amount <= 0:
-            await interaction.response.send_message(
-                "❌ Amount must be greater than 0!",
-                ephemeral=True
-            )
-            return
-        
-        user_id = str(user.id)
-        pack_info = PACK_TYPES[pack_type]
-        old_amount = self.bot.cf_packs[user_id][pack_type]
-        self.bot.cf_packs[user_id][pack_type] = max(0, self.bot.cf_packs[user_id][pack_type] - amount)
-        new_amount = self.bot.cf_packs[user_id][pack_type]
-        
-        embed = Embed(
-            title="✅ Packs Removed",
-            description=f"Removed **{amount} {pack_info['name']}s** {pack_info['emoji']} from {user.mention}",
-            color=Color.red()
-        )
-        embed.add_field(name="Old Amount", value=f"{old_amount} packs", inline=True)
-        embed.add_field(name="New Amount", value=f"{new_amount} packs", inline=True)
-        embed.set_footer(text=f"Admin: {interaction.user.name}")
-        
-        await interaction.response.send_message(embed=embed, ephemeral=True)
-        
-        logger.info(
-            f"[CF COINS ADMIN REMOVE PACKS] {interaction.user} ({interaction.user.id}) "
-            f"removed {amount} {pack_info['name']}s from {user} ({user.id})"
-        )
-        
-        await self.log_action(
-            title="🔧 Admin: Packs Removed",
-            description=f"Admin {interaction.user.mention} removed packs from {user.mention}",
-            color=Color.red(),
-            fields=[
-                {"name": "Admin", "value": f"{interaction.user.name} ({interaction.user.id})", "inline": True},
-                {"name": "Target User", "value": f"{user.name} ({user.id})", "inline": True},
-                {"name": "Pack Type", "value": f"{pack_info['emoji']} {pack_info['name']}", "inline": True},
-                {"name": "Amount Removed", "value": f"{amount} packs", "inline": True},
-                {"name": "Old Amount", "value": f"{old_amount} packs", "inline": True},
-                {"name": "New Amount", "value": f"{new_amount} packs", "inline": True}
-            ]
+    async def removepacks(
+        self,
+        interaction: discord.Interaction[BallsDexBot],
+        user: discord.User,
+        pack_type: str,
+        amount: app_commands.Range[int, 1, ADMIN_MAX_AMOUNT],
+    ):
+        await self.cfcoins._admin_apply(
+            interaction, user, amount, kind="packs", op="remove", pack_type=pack_type
         )
 
 
 async def setup(bot: BallsDexBot):
-    await bot.add_cog(CFCoins(bot))
+    cog = CFCoins(bot)
+    await bot.add_cog(cog)
+    await bot.add_cog(CFCoinsAdmin(cog))
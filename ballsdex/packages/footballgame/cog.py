@@ -1,4 +1,4 @@
-from collections import defaultdict
+import asyncio
 from typing import TYPE_CHECKING, cast
 
 import discord
@@ -14,7 +14,7 @@ from ballsdex.core.utils.transformers import (
     SpecialEnabledTransform,
     TradeCommandType,
 )
-from ballsdex.packages.footballgame.game_user import GameUser
+from ballsdex.packages.footballgame.game_user import POSITION_CAPS, POSITIONS, GameUser
 from ballsdex.packages.footballgame.menu import GameMenu
 from ballsdex.settings import settings
 
@@ -62,33 +62,26 @@ class FootballGame(commands.GroupCog, group_name="game"):
         else:
             raise TypeError("Missing interaction or channel")
 
-        if guild.id not in self.games:
-            self.games[guild.id] = defaultdict(list)
-        if channel.id not in self.games[guild.id]:
+        guild_games = self.games.get(guild.id)
+        if not guild_games or channel.id not in guild_games:
             return (None, None)
-        to_remove: list[GameMenu] = []
-        for game in self.games[guild.id][channel.id]:
-            if (
+        channel_games = guild_games[channel.id]
+        # drop the finished games in place, the list is shared with the cache
+        channel_games[:] = [
+            game
+            for game in channel_games
+            if not (
                 game.current_view.is_finished()
                 or game.player1.cancelled
                 or game.player2.cancelled
-            ):
-                to_remove.append(game)
-                continue
+            )
+        ]
+        for game in channel_games:
             try:
-                player = game._get_player(user)
+                return (game, game._get_player(user))
             except RuntimeError:
                 continue
-            else:
-                break
-        else:
-            for game in to_remove:
-                self.games[guild.id][channel.id].remove(game)
-            return (None, None)
-
-        for game in to_remove:
-            self.games[guild.id][channel.id].remove(game)
-        return (game, player)
+        return (None, None)
 
     @app_commands.command()
     async def start(self, interaction: discord.Interaction["BallsDexBot"], user: discord.User):
@@ -108,15 +101,18 @@ class FootballGame(commands.GroupCog, group_name="game"):
                 "You cannot play with yourself.", ephemeral=True
             )
             return
-        player1, _ = await Player.get_or_create(discord_id=interaction.user.id)
-        player2, _ = await Player.get_or_create(discord_id=user.id)
-        blocked = await player1.is_blocked(player2)
+        (player1, _), (player2, _) = await asyncio.gather(
+            Player.get_or_create(discord_id=interaction.user.id),
+            Player.get_or_create(discord_id=user.id),
+        )
+        blocked, blocked2 = await asyncio.gather(
+            player1.is_blocked(player2), player2.is_blocked(player1)
+        )
         if blocked:
             await interaction.response.send_message(
                 "You cannot start a game with a user that you have blocked.", ephemeral=True
             )
             return
-        blocked2 = await player2.is_blocked(player1)
         if blocked2:
             await interaction.response.send_message(
                 "You cannot start a game with a user that has blocked you.", ephemeral=True
@@ -145,7 +141,9 @@ class FootballGame(commands.GroupCog, group_name="game"):
         menu = GameMenu(
             self, interaction, GameUser(interaction.user, player1), GameUser(user, player2)
         )
-        self.games[interaction.guild.id][interaction.channel.id].append(menu)
+        self.games.setdefault(interaction.guild.id, {}).setdefault(
+            interaction.channel.id, []
+        ).append(menu)
         await menu.start()
         await interaction.response.send_message("Game started!", ephemeral=True)
 
@@ -173,7 +171,7 @@ class FootballGame(commands.GroupCog, group_name="game"):
             return
         
         position = position.upper()
-        if position not in ["GK", "DF", "MF", "FW"]:
+        if position not in POSITION_CAPS:
             await interaction.response.send_message(
                 "Invalid position! Use GK, DF, MF, or FW.", ephemeral=True
             )
@@ -213,13 +211,12 @@ class FootballGame(commands.GroupCog, group_name="game"):
             )
             return
         
-        for pos_players in player.team.values():
-            if countryball in pos_players:
-                await interaction.followup.send(
-                    f"You already have this {settings.collectible_name} in your team.",
-                    ephemeral=True,
-                )
-                return
+        if countryball.pk in player.team_pks:
+            await interaction.followup.send(
+                f"You already have this {settings.collectible_name} in your team.",
+                ephemeral=True,
+            )
+            return
                 
         if await countryball.is_locked():
             await interaction.followup.send(
@@ -229,9 +226,8 @@ class FootballGame(commands.GroupCog, group_name="game"):
             )
             return
         
-        position_caps = {"GK": 1, "DF": 4, "MF": 3, "FW": 3}
         current_count = len(player.team[position])
-        max_capacity = position_caps[position]
+        max_capacity = POSITION_CAPS[position]
         
         if current_count >= max_capacity:
             await interaction.followup.send(
@@ -242,7 +238,7 @@ class FootballGame(commands.GroupCog, group_name="game"):
             return
 
         await countryball.lock_for_trade()
-        player.team[position].append(countryball)
+        player.add_to_team(position, countryball)
         await interaction.followup.send(
             f"{countryball.countryball.country} added to {position} ({current_count + 1}/{max_capacity}).", 
             ephemeral=True
@@ -252,10 +248,9 @@ class FootballGame(commands.GroupCog, group_name="game"):
     async def position_autocomplete(
         self, interaction: discord.Interaction["BallsDexBot"], current: str
     ) -> list[app_commands.Choice[str]]:
-        positions = ["GK", "DF", "MF", "FW"]
         return [
             app_commands.Choice(name=pos, value=pos)
-            for pos in positions
+            for pos in POSITIONS
             if current.upper() in pos
         ]
 
@@ -293,22 +288,15 @@ class FootballGame(commands.GroupCog, group_name="game"):
             )
             return
         
-        found = False
-        for position, pos_players in player.team.items():
-            if countryball in pos_players:
-                pos_players.remove(countryball)
-                await countryball.unlock()
-                found = True
-                break
-        
-        if not found:
+        if player.remove_from_team(countryball):
+            await countryball.unlock()
+        else:
             await interaction.response.send_message(
                 f"That {settings.collectible_name} is not in your team.", ephemeral=True
             )
             return
         
-        if countryball in player.bets:
-            player.bets.remove(countryball)
+        player.remove_bet(countryball)
             
         await interaction.response.send_message(
             f"{countryball.countryball.country} removed from team.", ephemeral=True
@@ -354,28 +342,25 @@ class FootballGame(commands.GroupCog, group_name="game"):
             )
             return
         
-        if countryball in player.bets:
+        if countryball.pk in player.bets_pks:
             await interaction.response.send_message(
                 f"You have already bet this {settings.collectible_name}!",
                 ephemeral=True,
             )
             return
         
-        in_team = any(countryball in pos_list for pos_list in player.team.values())
-        is_locked = await countryball.is_locked()
-        
-        if is_locked and not in_team:
-            await interaction.response.send_message(
-                f"This {settings.collectible_name} is currently locked in another trade. "
-                "Please try again later.",
-                ephemeral=True,
-            )
-            return
-        
-        if not in_team and not is_locked:
+        # balls of the team are already locked by this game
+        if countryball.pk not in player.team_pks:
+            if await countryball.is_locked():
+                await interaction.response.send_message(
+                    f"This {settings.collectible_name} is currently locked in another trade. "
+                    "Please try again later.",
+                    ephemeral=True,
+                )
+                return
             await countryball.lock_for_trade()
         
-        player.bets.append(countryball)
+        player.add_bet(countryball)
         await interaction.response.send_message(
             f"✅ {countryball.countryball.country} added to your bet! Winner takes all betted balls!",
             ephemeral=True,
@@ -2,7 +2,7 @@ from typing import TYPE_CHECKING
 
 import discord
 
-from ballsdex.packages.footballgame.game_user import GameUser
+from ballsdex.packages.footballgame.game_user import POSITION_CAPS, GameUser
 
 if TYPE_CHECKING:
     from ballsdex.core.bot import BallsDexBot
@@ -31,25 +31,16 @@ def _build_team_display(player: GameUser, bot: "BallsDexBot") -> str:
     """Build a formatted display of the team organized by position."""
     lines = []
     
-    positions = ["GK", "DF", "MF", "FW"]
-    position_caps = {"GK": 1, "DF": 4, "MF": 3, "FW": 3}
-    position_names = {
-        "GK": "Goalkeeper",
-        "DF": "Defender",
-        "MF": "Midfielder",
-        "FW": "Forward"
-    }
-    
-    for pos in positions:
-        players = player.team.get(pos, [])
-        cap = position_caps[pos]
+    for pos, cap in POSITION_CAPS.items():
+        players = player.team[pos]
         current = len(players)
         
         if players:
             lines.append(f"**{pos} ({current}/{cap})**")
             for p in players:
-                emoji = bot.get_emoji(p.countryball.emoji_id) if hasattr(p.countryball, 'emoji_id') else ""
-                name = p.countryball.country if hasattr(p, 'countryball') else f"Player {p.pk}"
+                ball = p.countryball
+                emoji = bot.get_emoji(ball.emoji_id)
+                name = ball.country
                 stats = f"ATK: {p.attack} | HP: {p.health}"
                 if player.locked:
                     lines.append(f"• *{emoji} {name} | {stats}*")
@@ -62,9 +53,10 @@ def _build_team_display(player: GameUser, bot: "BallsDexBot") -> str:
     if player.bets:
         lines.append(f"\n**BET**")
         for bet_ball in player.bets:
-            emoji = bot.get_emoji(bet_ball.countryball.emoji_id) if hasattr(bet_ball.countryball, 'emoji_id') else ""
-            name = bet_ball.countryball.country if hasattr(bet_ball, 'countryball') else f"Player {bet_ball.pk}"
-            bet_id = f"#{bet_ball.pk}" if hasattr(bet_ball, 'pk') else ""
+            ball = bet_ball.countryball
+            emoji = bot.get_emoji(ball.emoji_id)
+            name = ball.country
+            bet_id = f"#{bet_ball.pk}"
             stats = f"ATK: {bet_ball.attack} | HP: {bet_ball.health}"
             lines.append(f"• {emoji} {bet_id} {name} {stats}")
     
@@ -1,47 +1,85 @@
 from dataclasses import dataclass, field
+from itertools import chain
 from typing import TYPE_CHECKING
 
 from ballsdex.core.models import BlacklistedID
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator
+
     import discord
 
     from ballsdex.core.bot import BallsDexBot
     from ballsdex.core.models import BallInstance, Player
 
+POSITIONS = ("GK", "DF", "MF", "FW")
+POSITION_CAPS = {"GK": 1, "DF": 4, "MF": 3, "FW": 3}
+
 
 @dataclass(slots=True)
 class GameUser:
     user: "discord.User | discord.Member"
     player: "Player"
     team: dict[str, list["BallInstance"]] = field(
-        default_factory=lambda: {"GK": [], "DF": [], "MF": [], "FW": []}
+        default_factory=lambda: {position: [] for position in POSITIONS}
     )
+    team_pks: set[int] = field(default_factory=set)
     bets: list["BallInstance"] = field(default_factory=list)
+    bets_pks: set[int] = field(default_factory=set)
     locked: bool = False
     cancelled: bool = False
     won: bool = False
     blacklisted: bool | None = None
 
-    def get_all_players(self) -> list["BallInstance"]:
-        """Get all players from all positions."""
-        all_players = []
+    def add_to_team(self, position: str, ball: "BallInstance"):
+        """Add a ball to the given position."""
+        self.team[position].append(ball)
+        self.team_pks.add(ball.pk)
+
+    def remove_from_team(self, ball: "BallInstance") -> bool:
+        """Remove a ball from the team. Returns whether it was in the team."""
+        if ball.pk not in self.team_pks:
+            return False
+        self.team_pks.discard(ball.pk)
         for position_players in self.team.values():
-            all_players.extend(position_players)
-        return all_players
+            if ball in position_players:
+                position_players.remove(ball)
+                break
+        return True
+
+    def clear_team(self):
+        """Remove every ball from the team."""
+        for position_players in self.team.values():
+            position_players.clear()
+        self.team_pks.clear()
+
+    def add_bet(self, ball: "BallInstance"):
+        """Add a ball to the bets."""
+        self.bets.append(ball)
+        self.bets_pks.add(ball.pk)
+
+    def remove_bet(self, ball: "BallInstance"):
+        """Remove a ball from the bets if it was bet."""
+        if ball.pk in self.bets_pks:
+            self.bets_pks.discard(ball.pk)
+            self.bets.remove(ball)
+
+    def clear_bets(self):
+        """Remove every ball from the bets."""
+        self.bets.clear()
+        self.bets_pks.clear()
+
+    def iter_all_players(self) -> "Iterator[BallInstance]":
+        """Iterate over the players of all positions without building a list."""
+        return chain.from_iterable(self.team.values())
 
     def get_team_strength(self) -> float:
         """Calculate team strength based on attack and health stats."""
-        total_strength = 0.0
-        all_players = self.get_all_players()
-        
-        if not all_players:
+        if not self.team_pks:
             return 0.0
         
-        for player in all_players:
-            total_strength += player.attack + player.health
-        
-        return total_strength / len(all_players)
+        total_strength = sum(player.attack + player.health for player in self.iter_all_players())
+        return total_strength / len(self.team_pks)
 
     def has_minimum_team(self) -> bool:
         """Check if team has at least one player per position."""
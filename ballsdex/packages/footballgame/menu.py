@@ -4,8 +4,9 @@ import asyncio
 import logging
 import random
 import secrets
-from datetime import datetime, timedelta
-from typing import TYPE_CHECKING, cast
+from collections import deque
+from datetime import timedelta
+from typing import TYPE_CHECKING, Iterable, cast
 
 import discord
 from discord.ui import Button, View, button
@@ -23,10 +24,37 @@ if TYPE_CHECKING:
 
 log = logging.getLogger("ballsdex.packages.footballgame.menu")
 
+GAME_TIMEOUT = 60 * 30
+
+MATCH_EVENT_TEMPLATES = {
+    "goal": "{minute}' | GOAL by {country} - {player}",
+    "save": "{minute}' | SAVE by {country} - {player}",
+    "offside": "{minute}' | OFFSIDE GOAL by {country} - {player}",
+    "defense": "{minute}' | CRUCIAL DEFENSE by {country} - {player}",
+    "foul": "{minute}' | FOUL by {country} - {player}",
+}
+
+# event type: (whether the winner of the action is the actor, position of the actor)
+MATCH_EVENT_ACTORS = {
+    "goal": (True, "FW"),
+    "save": (True, "GK"),
+    "offside": (False, "FW"),
+    "defense": (True, "DF"),
+    "foul": (False, "MF"),
+}
+MATCH_EVENT_TYPES = tuple(MATCH_EVENT_ACTORS)
+
+
+async def unlock_balls(pks: Iterable[int]):
+    """Unlock the given ball instances with a single query."""
+    pks = list(pks)
+    if pks:
+        await BallInstance.filter(pk__in=pks).update(locked=None)
+
 
 class GameView(View):
     def __init__(self, game: GameMenu):
-        super().__init__(timeout=60 * 30)
+        super().__init__(timeout=GAME_TIMEOUT)
         self.game = game
 
     async def interaction_check(self, interaction: discord.Interaction["BallsDexBot"], /) -> bool:
@@ -101,12 +129,10 @@ class GameView(View):
             )
             return
 
-        for position_players in player.team.values():
-            for ball in position_players:
-                await ball.unlock()
-            position_players.clear()
+        await unlock_balls(player.team_pks | player.bets_pks)
+        player.clear_team()
         
-        player.bets.clear()
+        player.clear_bets()
 
         await interaction.followup.send("Team cleared.", ephemeral=True)
 
@@ -149,9 +175,11 @@ class GameMenu:
         self.player2 = player2
         self.embed = discord.Embed()
         self.task: asyncio.Task | None = None
+        self.finished = False
         self.current_view: GameView = GameView(self)
         self.message: discord.Message
         self.match_events: list[str] = []
+        self.recent_events: deque[str] = deque(maxlen=10)
 
     def _get_player(self, user: discord.User | discord.Member) -> GameUser:
         if user.id == self.player1.user.id:
@@ -160,6 +188,19 @@ class GameMenu:
             return self.player2
         raise RuntimeError(f"User with ID {user.id} cannot be found in the game")
 
+    def _is_aborted(self) -> bool:
+        """Whether the game ended or was cancelled while the match was being played."""
+        return self.finished or self.player1.cancelled or self.player2.cancelled
+
+    def _locked_pks(self) -> set[int]:
+        """Primary keys of every ball locked by this game, in teams or bets."""
+        return (
+            self.player1.team_pks
+            | self.player1.bets_pks
+            | self.player2.team_pks
+            | self.player2.bets_pks
+        )
+
     def _generate_embed(self):
         add_command = self.cog.add.extras.get("mention", "`/game add`")
         remove_command = self.cog.remove.extras.get("mention", "`/game remove`")
@@ -167,6 +208,7 @@ class GameMenu:
 
         self.embed.title = "⚽ ChampFut Game"
         self.embed.color = discord.Colour.green()
+        timeout = format_dt(utcnow() + timedelta(seconds=GAME_TIMEOUT), style="R")
         self.embed.description = (
             f"Build your team using {add_command} and {remove_command}.\n"
             "**You need at least one player in each position: GK, DF, MF, FW**\n"
@@ -175,7 +217,7 @@ class GameMenu:
             "**When both players lock, the match will simulate automatically (~1 minute).**\n"
             "**The stronger team has a 55% chance to win important events!**\n"
             "**Winner takes ONLY the betted balls from both players!**\n\n"
-            f"*This game will timeout {format_dt(utcnow() + timedelta(minutes=30), style='R')}.*"
+            f"*This game will timeout {timeout}.*"
         )
         self.embed.set_footer(
             text="This message is updated every 15 seconds."
@@ -184,11 +226,11 @@ class GameMenu:
     async def update_message_loop(self):
         """Update the message every 15 seconds."""
         assert self.task
-        start_time = datetime.utcnow()
+        deadline = self.bot.loop.time() + GAME_TIMEOUT
 
         while True:
             await asyncio.sleep(15)
-            if datetime.utcnow() - start_time > timedelta(minutes=30):
+            if self.bot.loop.time() > deadline:
                 self.embed.colour = discord.Colour.dark_red()
                 await self.cancel("The game timed out")
                 return
@@ -219,14 +261,19 @@ class GameMenu:
         )
         self.task = self.bot.loop.create_task(self.update_message_loop())
 
-    async def cancel(self, reason: str = "The game has been cancelled."):
-        """Cancel the game immediately."""
-        if self.task:
+    def _stop_refresh(self):
+        """Stop the message refresh task, unless it is the one ending the game."""
+        if self.task and self.task is not asyncio.current_task():
             self.task.cancel()
 
-        for position_players in list(self.player1.team.values()) + list(self.player2.team.values()):
-            for ball in position_players:
-                await ball.unlock()
+    async def cancel(self, reason: str = "The game has been cancelled."):
+        """Cancel the game immediately. Does nothing if the game already ended."""
+        if self.finished:
+            return
+        self.finished = True
+        self._stop_refresh()
+
+        await unlock_balls(self._locked_pks())
 
         self.current_view.stop()
         for item in self.current_view.children:
@@ -253,22 +300,36 @@ class GameMenu:
         self, minute: int, player_name: str, ball: BallInstance, event_type: str
     ) -> str:
         """Generate a realistic match event description."""
-        player_country = ball.countryball.country
-        
-        events = {
-            "goal": f"{minute}' | GOAL by {player_country} - {player_name}",
-            "save": f"{minute}' | SAVE by {player_country} - {player_name}",
-            "offside": f"{minute}' | OFFSIDE GOAL by {player_country} - {player_name}",
-            "defense": f"{minute}' | CRUCIAL DEFENSE by {player_country} - {player_name}",
-            "foul": f"{minute}' | FOUL by {player_country} - {player_name}",
-        }
-        
-        return events.get(event_type, f"{minute}' | Event")
+        return MATCH_EVENT_TEMPLATES.get(event_type, "{minute}' | Event").format(
+            minute=minute, country=ball.countryball.country, player=player_name
+        )
+
+    def _set_events_field(self, events_text: str):
+        """
+        Show the match events below the team fields. The teams are locked during the match,
+        so their fields are rendered once at kickoff and left untouched.
+        """
+        value = f"```\n{events_text}\n```"
+        if len(self.embed.fields) > 2:
+            self.embed.set_field_at(2, name="📋 Match Events", value=value, inline=False)
+        else:
+            self.embed.add_field(name="📋 Match Events", value=value, inline=False)
+
+    def _add_match_event(self, event: str):
+        """Record a match event in the full log and in the recent events shown live."""
+        self.match_events.append(event)
+        self.recent_events.append(event)
+
+    async def _update_match_message(self, status: str, score_line: str):
+        """Show the match status, the score and the latest events."""
+        self.embed.description = f"**{status}**\n\n{score_line}"
+        if self.recent_events:
+            self._set_events_field("\n".join(self.recent_events))
+        await self.message.edit(embed=self.embed)
 
     async def execute_game(self):
         """Execute the football match simulation."""
-        if self.task:
-            self.task.cancel()
+        self._stop_refresh()
 
         self.embed.title = "⚽ ChampFut Game"
         self.embed.color = discord.Color.blue()
@@ -293,197 +354,137 @@ class GameMenu:
             weaker_player = self.player2
             stronger_chance = 0.50
 
-        score = {self.player1.user.name: 0, self.player2.user.name: 0}
+        stronger_first = (stronger_player, weaker_player)
+        weaker_first = (weaker_player, stronger_player)
+
+        name1 = self.player1.user.name
+        name2 = self.player2.user.name
+        # goals of player1 and player2
+        score = [0, 0]
         self.match_events = []
+        self.recent_events.clear()
 
-        event_types = ["goal", "save", "offside", "defense", "foul"]
-        
         for i in range(10):
             minute = (i + 1) * 10
             await asyncio.sleep(6)
+            if self._is_aborted():
+                return
 
-            winner_player = stronger_player if random.random() < stronger_chance else weaker_player
-            loser_player = weaker_player if winner_player == stronger_player else stronger_player
+            winner_player, loser_player = (
+                stronger_first if random.random() < stronger_chance else weaker_first
+            )
             
-            event_type = random.choice(event_types)
+            event_type = random.choice(MATCH_EVENT_TYPES)
             
+            by_winner, position = MATCH_EVENT_ACTORS[event_type]
+            actor = winner_player if by_winner else loser_player
+            # locked teams have at least one player per position
+            ball = random.choice(actor.team[position])
+            self._add_match_event(
+                self._generate_match_event(minute, actor.user.name, ball, event_type)
+            )
             if event_type == "goal":
-                all_forwards = winner_player.team["FW"]
-                if all_forwards:
-                    scorer = random.choice(all_forwards)
-                    event = self._generate_match_event(
-                        minute, winner_player.user.name, scorer, "goal"
-                    )
-                    score[winner_player.user.name] += 1
-                    self.match_events.append(event)
-            elif event_type == "save":
-                all_gks = winner_player.team["GK"]
-                if all_gks:
-                    saver = random.choice(all_gks)
-                    event = self._generate_match_event(
-                        minute, winner_player.user.name, saver, "save"
-                    )
-                    self.match_events.append(event)
-            elif event_type == "offside":
-                all_forwards = loser_player.team["FW"]
-                if all_forwards:
-                    offsider = random.choice(all_forwards)
-                    event = self._generate_match_event(
-                        minute, loser_player.user.name, offsider, "offside"
-                    )
-                    self.match_events.append(event)
-            elif event_type == "defense":
-                all_defenders = winner_player.team["DF"]
-                if all_defenders:
-                    defender = random.choice(all_defenders)
-                    event = self._generate_match_event(
-                        minute, winner_player.user.name, defender, "defense"
-                    )
-                    self.match_events.append(event)
-            elif event_type == "foul":
-                all_mids = loser_player.team["MF"]
-                if all_mids:
-                    fouler = random.choice(all_mids)
-                    event = self._generate_match_event(
-                        minute, loser_player.user.name, fouler, "foul"
-                    )
-                    self.match_events.append(event)
-
-            events_text = "\n".join(self.match_events[-10:])
-            score_line = f"**{self.player1.user.name} | {score[self.player1.user.name]} - {score[self.player2.user.name]} | {self.player2.user.name}**"
-            
-            self.embed.description = f"**Match in Progress...**\n\n{score_line}"
-            fill_game_embed_fields(self.embed, self.bot, self.player1, self.player2)
-            
-            if len(events_text) > 0:
-                self.embed.add_field(
-                    name="📋 Match Events",
-                    value=f"```\n{events_text}\n```",
-                    inline=False
-                )
-            
-            await self.message.edit(embed=self.embed)
+                score[0 if actor is self.player1 else 1] += 1
+
+            status = "Match in Progress..."
+            if i == 9 and score[0] == score[1]:
+                # announce the shootout with the last tick rather than in a separate edit
+                self._add_match_event("90' | DRAW! Going to penalties!")
+                status = "Match tied! Penalty Shootout starting..."
+            score_line = f"**{name1} | {score[0]} - {score[1]} | {name2}**"
+            await self._update_match_message(status, score_line)
 
         await asyncio.sleep(2)
 
-        if score[self.player1.user.name] > score[self.player2.user.name]:
+        score_text = (str(score[0]), str(score[1]))
+        if score[0] > score[1]:
             winner = self.player1
             loser = self.player2
-        elif score[self.player2.user.name] > score[self.player1.user.name]:
+        elif score[1] > score[0]:
             winner = self.player2
             loser = self.player1
         else:
-            self.match_events.append("90' | DRAW! Going to penalties!")
-            
-            events_text = "\n".join(self.match_events[-10:])
-            score_line = f"**{self.player1.user.name} | {score[self.player1.user.name]} - {score[self.player2.user.name]} | {self.player2.user.name}**"
-            
-            self.embed.description = f"**Match tied! Penalty Shootout starting...**\n\n{score_line}"
-            fill_game_embed_fields(self.embed, self.bot, self.player1, self.player2)
-            
-            if len(events_text) > 0:
-                self.embed.add_field(
-                    name="📋 Match Events",
-                    value=f"```\n{events_text}\n```",
-                    inline=False
-                )
-            
-            await self.message.edit(embed=self.embed)
             await asyncio.sleep(3)
+            if self._is_aborted():
+                return
             
-            penalty_score = {self.player1.user.name: 0, self.player2.user.name: 0}
+            penalty_score = [0, 0]
             
             for penalty_round in range(1, 4):
                 await asyncio.sleep(4)
+                if self._is_aborted():
+                    return
                 
-                for shooter_player in [self.player1, self.player2]:
-                    other_player = self.player2 if shooter_player == self.player1 else self.player1
+                for shooter_index, (shooter_player, other_player) in enumerate(
+                    ((self.player1, self.player2), (self.player2, self.player1))
+                ):
+                    shooter = random.choice(shooter_player.team["FW"])
+                    gk = random.choice(other_player.team["GK"])
                     
-                    forwards = shooter_player.team.get("FW", [])
-                    goalkeepers = other_player.team.get("GK", [])
+                    shooter_strength = shooter.attack + shooter.health
+                    gk_strength = gk.attack + gk.health
                     
-                    if forwards and goalkeepers:
-                        shooter = random.choice(forwards)
-                        gk = random.choice(goalkeepers)
-                        
-                        shooter_strength = shooter.attack + shooter.health
-                        gk_strength = gk.attack + gk.health
-                        
-                        if shooter_strength > gk_strength:
-                            success_chance = 0.70
-                        elif gk_strength > shooter_strength:
-                            success_chance = 0.50
-                        else:
-                            success_chance = 0.60
-                        
-                        if random.random() < success_chance:
-                            penalty_score[shooter_player.user.name] += 1
-                            self.match_events.append(
-                                f"Penalty {penalty_round} | GOAL by {shooter.countryball.country} - {shooter_player.user.name}"
-                            )
-                        else:
-                            self.match_events.append(
-                                f"Penalty {penalty_round} | SAVED by {gk.countryball.country} - {other_player.user.name}"
-                            )
-                
-                events_text = "\n".join(self.match_events[-10:])
-                score_line = f"**Penalties: {self.player1.user.name} {penalty_score[self.player1.user.name]} - {penalty_score[self.player2.user.name]} {self.player2.user.name}**"
-                
-                self.embed.description = f"**Penalty Shootout...**\n\n{score_line}"
-                fill_game_embed_fields(self.embed, self.bot, self.player1, self.player2)
-                
-                if len(events_text) > 0:
-                    self.embed.add_field(
-                        name="📋 Match Events",
-                        value=f"```\n{events_text}\n```",
-                        inline=False
-                    )
+                    if shooter_strength > gk_strength:
+                        success_chance = 0.70
+                    elif gk_strength > shooter_strength:
+                        success_chance = 0.50
+                    else:
+                        success_chance = 0.60
+                    
+                    if random.random() < success_chance:
+                        penalty_score[shooter_index] += 1
+                        self._add_match_event(
+                            f"Penalty {penalty_round} | GOAL by "
+                            f"{shooter.countryball.country} - {shooter_player.user.name}"
+                        )
+                    else:
+                        self._add_match_event(
+                            f"Penalty {penalty_round} | SAVED by "
+                            f"{gk.countryball.country} - {other_player.user.name}"
+                        )
                 
-                await self.message.edit(embed=self.embed)
+                score_line = (
+                    f"**Penalties: {name1} {penalty_score[0]} - {penalty_score[1]} {name2}**"
+                )
+                await self._update_match_message("Penalty Shootout...", score_line)
             
-            if penalty_score[self.player1.user.name] > penalty_score[self.player2.user.name]:
+            if penalty_score[0] > penalty_score[1]:
                 winner = self.player1
                 loser = self.player2
-            elif penalty_score[self.player2.user.name] > penalty_score[self.player1.user.name]:
+            elif penalty_score[1] > penalty_score[0]:
                 winner = self.player2
                 loser = self.player1
             else:
                 winner = secrets.choice([self.player1, self.player2])
-                loser = self.player2 if winner == self.player1 else self.player1
-                self.match_events.append(
+                loser = self.player2 if winner is self.player1 else self.player1
+                self._add_match_event(
                     f"Sudden Death | GOAL by {winner.user.name}!"
                 )
-            
-            score[self.player1.user.name] = f"{score[self.player1.user.name]} ({penalty_score[self.player1.user.name]})"
-            score[self.player2.user.name] = f"{score[self.player2.user.name]} ({penalty_score[self.player2.user.name]})"
 
+            score_text = (f"{score[0]} ({penalty_score[0]})", f"{score[1]} ({penalty_score[1]})")
+
+        if self.finished:
+            # cancelled during the match, the balls were already released
+            return
+        self.finished = True
         winner.won = True
+        winner_index = 0 if winner is self.player1 else 1
 
-        all_team_balls = winner.get_all_players() + loser.get_all_players()
-        
-        valid_player1_bets = [b for b in self.player1.bets if b in all_team_balls]
-        valid_player2_bets = [b for b in self.player2.bets if b in all_team_balls]
-        betted_balls = valid_player1_bets + valid_player2_bets
+        # only the bets fielded in the team are at stake
+        betted_balls = [
+            ball
+            for player in (self.player1, self.player2)
+            for ball in player.bets
+            if ball.pk in player.team_pks
+        ]
+
+        # the game is over, stop the buttons before the slower database work
+        self.current_view.stop()
+        for item in self.current_view.children:
+            item.disabled = True
 
         try:
-            for ball in betted_balls:
-                ball.player = winner.player
-                await ball.save()
-                await ball.unlock()
-            
-            for ball in all_team_balls:
-                if ball not in betted_balls:
-                    await ball.unlock()
-
-            for position in winner.team.values():
-                position.clear()
-            for position in loser.team.values():
-                position.clear()
-            winner.bets.clear()
-            loser.bets.clear()
-
-            final_score = f"{self.player1.user.name} | {score[self.player1.user.name]} - {score[self.player2.user.name]} | {self.player2.user.name}"
-            events_text = "\n".join(self.match_events)
+            final_score = f"{name1} | {score_text[0]} - {score_text[1]} | {name2}"
             
             self.embed.title = "🎉 Match Complete! 🎉"
             self.embed.color = discord.Color.gold()
@@ -501,27 +502,38 @@ class GameMenu:
                 f"Winner: {winner.user.name}\n\n"
                 f"{result_message}"
             )
-            
+
+            fill_game_embed_fields(self.embed, self.bot, self.player1, self.player2)
+            events_text = "\n".join(self.match_events)
             if len(events_text) > 0:
+                # field values are limited to 1024 characters, keep the end of the match
+                if len(events_text) > 1016:
+                    events_text = events_text[-1016:].partition("\n")[2]
                 self.embed.add_field(
                     name="📋 Full Match Events",
                     value=f"```\n{events_text}\n```",
                     inline=False
                 )
+            await self.message.edit(embed=self.embed, view=self.current_view)
 
-            self.current_view.stop()
-            for item in self.current_view.children:
-                item.disabled = True
+            if betted_balls:
+                await BallInstance.filter(pk__in=[ball.pk for ball in betted_balls]).update(
+                    player_id=winner.player.pk
+                )
+            await unlock_balls(self._locked_pks())
 
-            fill_game_embed_fields(self.embed, self.bot, self.player1, self.player2)
-            await self.message.edit(embed=self.embed, view=self.current_view)
+            winner.clear_team()
+            loser.clear_team()
+            winner.clear_bets()
+            loser.clear_bets()
 
             await self.channel.send(
                 f"🎉 **Match Result:** {winner.user.mention} defeats {loser.user.mention} "
-                f"({score[winner.user.name]}-{score[loser.user.name]}) "
+                f"({score_text[winner_index]}-{score_text[1 - winner_index]}) "
                 f"and wins {len(betted_balls)} betted {settings.plural_collectible_name}! 🎉"
             )
 
         except Exception as e:
             log.exception(f"Failed to execute game: {e}")
+            self.finished = False
             await self.cancel("An error occurred while executing the game.")